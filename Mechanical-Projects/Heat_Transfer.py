@@ -28,6 +28,9 @@ The program implements an explicit finite difference approach:
 
     T_new[i] = T[i] + (α * dt / dx²) * (T[i+1] - 2*T[i] + T[i-1])
 
+Setting `scheme` to "implicit" (backward Euler) or "crank-nicolson" solves a
+tridiagonal system per step instead, which removes the stability limit on dt.
+
 After running, the program generates a graph showing how the temperature 
 evolves over time.
 
@@ -37,6 +40,7 @@ evolves over time.
 
 import numpy as np
 import matplotlib.pyplot as plt
+from heat_solver import simulate_rods, snapshot_steps, solve_steady
 
 # Define parameters
 L = 1.0  # Length of the rod (m)
@@ -50,33 +54,29 @@ T_initial = 20  # Initial temperature (°C)
 
 dt = 0.001  # Time step (s)
 Nt = 500  # Number of time steps
+scheme = "explicit"  # "explicit", "implicit" or "crank-nicolson"
 
 # Stability condition (explicit scheme): dt <= (dx^2) / (2*alpha)
-assert dt <= (dx**2) / (2 * alpha), "Time step too large for stability!"
-
-# Initialize temperature field
-T = np.ones(Nx) * T_initial
-T[0] = T_left
-T[-1] = T_right
-
-# Store temperature history for visualization
-T_history = [T.copy()]
-
-# Time-stepping loop (explicit finite difference method)
-for _ in range(Nt):
-    T_new = T.copy()
-    for i in range(1, Nx - 1):
-        T_new[i] = T[i] + alpha * dt / dx**2 * (T[i+1] - 2*T[i] + T[i-1])
-    T = T_new.copy()
-    T_history.append(T.copy())
+# The implicit schemes are unconditionally stable and allow much larger dt.
+if scheme == "explicit":
+    assert dt <= (dx**2) / (2 * alpha), "Time step too large for stability!"
 
-# Convert T_history to numpy array for plotting
-T_history = np.array(T_history)
+# Time-stepping (finite difference method, whole stencil per step)
+# Only the snapshots that are plotted are stored
+every = max(Nt // 10, 1)
+T_history = simulate_rods(L, Nx, alpha, dt, Nt, T_initial=T_initial, T_left=T_left, T_right=T_right,
+                          every=every, scheme=scheme)
 
 # Plot temperature distribution over time
 plt.figure(figsize=(10, 6))
-for i in range(0, Nt, Nt//10):  # Plot at different time intervals
-    plt.plot(np.linspace(0, L, Nx), T_history[i, :], label=f't={i*dt:.2f}s')
+for i, step in enumerate(snapshot_steps(Nt, every)):  # Plot at different time intervals
+    plt.plot(np.linspace(0, L, Nx), T_history[i, :], label=f't={step*dt:.2f}s')
+
+# Steady state: step with adaptive dt until the largest change per step is below 1e-6 °C
+T_steady, steady_steps, t_steady = solve_steady(L, Nx, alpha, dt, T_initial=T_initial, T_left=T_left,
+                                                T_right=T_right, scheme=scheme)
+print(f"Steady state reached after {steady_steps} steps (t={t_steady:.2f}s)")
+plt.plot(np.linspace(0, L, Nx), T_steady, 'k--', label=f'steady (t={t_steady:.0f}s)')
 
 plt.xlabel('Position (m)')
 plt.ylabel('Temperature (°C)')
@@ -3,37 +3,41 @@ import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import ttk
 import matplotlib.animation as animation
+from heat_solver import SCHEMES, simulate_rods, snapshot_steps, solve_steady, write_history
+from heat_render import export_in_background, frame_indices
 
-def heat_conduction_1D(length=1.0, nx=20, alpha=0.01, dt=0.001, time_steps=200):
-    dx = length / (nx - 1)
-    r = alpha * dt / dx**2
-    
-    # Initial temperature profile
-    T = np.ones(nx) * 20  # Initial temperature (20°C everywhere)
-    T[0], T[-1] = 100, 50  # Boundary conditions (fixed temperatures)
-    
-    T_hist = [T.copy()]
-    
-    for _ in range(time_steps):
-        T_new = T.copy()
-        for i in range(1, nx - 1):
-            T_new[i] = T[i] + r * (T[i+1] - 2*T[i] + T[i-1])
-        T = T_new.copy()
-        T_hist.append(T.copy())
-    
-    return np.array(T_hist)
+def heat_conduction_1D(length=1.0, nx=20, alpha=0.01, dt=0.001, time_steps=200, scheme="explicit",
+                       every=1, history_file=None):
+    # Initial temperature 20°C everywhere, boundaries fixed at 100°C and 50°C
+    if history_file:
+        # Stream snapshots to disk and read them back lazily
+        return write_history(history_file, length, nx, alpha, dt, time_steps, T_initial=20, T_left=100,
+                             T_right=50, every=every, scheme=scheme)
+    return simulate_rods(length, nx, alpha, dt, time_steps, T_initial=20, T_left=100, T_right=50,
+                         every=every, scheme=scheme)
 
-def animate_heat():
-    global length, nx, alpha, dt, time_steps
+def simulate_from_inputs():
+    global length, nx, alpha, dt, time_steps, scheme
     
     length = float(length_entry.get())
     nx = int(nx_entry.get())
     alpha = float(alpha_entry.get())
     dt = float(dt_entry.get())
     time_steps = int(time_steps_entry.get())
+    scheme = scheme_combo.get()
+    every = int(every_entry.get())
+    history_file = history_file_entry.get().strip()
+    
+    T_hist = heat_conduction_1D(length, nx, alpha, dt, time_steps, scheme, every, history_file)
+    times = snapshot_steps(time_steps, every) * dt
+    return T_hist, np.linspace(0, length, nx), times
+
+def animate_heat():
+    T_hist, x, times = simulate_from_inputs()
+    fps = float(fps_entry.get())
     
-    T_hist = heat_conduction_1D(length, nx, alpha, dt, time_steps)
-    x = np.linspace(0, length, nx)
+    # Sample the history down to the requested number of frames
+    frames = frame_indices(len(T_hist), int(frames_entry.get()), fps)
     
     fig, ax = plt.subplots()
     line, = ax.plot(x, T_hist[0], 'r-', linewidth=2)
@@ -46,7 +50,48 @@ def animate_heat():
         line.set_ydata(T_hist[frame])
         return line,
     
-    ani = animation.FuncAnimation(fig, update, frames=time_steps, interval=50, blit=True)
+    ani = animation.FuncAnimation(fig, update, frames=frames, interval=1000 / fps, blit=True)
+    plt.show()
+
+def export_animation():
+    path = export_entry.get().strip()
+    if not path:
+        export_label.config(text="Enter an export file name (.mp4 or .gif)")
+        return
+    T_hist, x, times = simulate_from_inputs()
+    
+    # Off-screen rendering and encoding run on a background worker
+    future = export_in_background(T_hist, x, path, target_frames=int(frames_entry.get()),
+                                  fps=float(fps_entry.get()), times=times)
+    export_label.config(text=f"Exporting {path}...")
+    
+    def check_export():
+        if not future.done():
+            root.after(200, check_export)
+        elif future.exception():
+            export_label.config(text=f"Export failed: {future.exception()}")
+        else:
+            export_label.config(text=f"Saved {future.result()}")
+    
+    check_export()
+
+def run_to_steady_state():
+    length = float(length_entry.get())
+    nx = int(nx_entry.get())
+    alpha = float(alpha_entry.get())
+    dt = float(dt_entry.get())
+    scheme = scheme_combo.get()
+    
+    # Adaptive time stepping until the rod stops changing
+    T, steps, t = solve_steady(length, nx, alpha, dt, T_initial=20, T_left=100, T_right=50, scheme=scheme)
+    steady_label.config(text=f"Steady state after {steps} steps (t = {t:.2f} s)")
+    
+    fig, ax = plt.subplots()
+    ax.plot(np.linspace(0, length, nx), T, 'r-', linewidth=2)
+    ax.set_ylim(0, 120)
+    ax.set_xlabel("Rod Length")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_title(f"Steady State Reached at t = {t:.2f} s")
     plt.show()
 
 # Tkinter GUI
@@ -78,5 +123,39 @@ time_steps_entry = tk.Entry(root)
 time_steps_entry.pack()
 time_steps_entry.insert(0, "200")
 
+tk.Label(root, text="Time Stepping Scheme:").pack()
+scheme_combo = ttk.Combobox(root, values=list(SCHEMES), state="readonly")
+scheme_combo.pack()
+scheme_combo.set("explicit")
+
+tk.Label(root, text="Store Every k Steps:").pack()
+every_entry = tk.Entry(root)
+every_entry.pack()
+every_entry.insert(0, "1")
+
+tk.Label(root, text="History File (.npy, optional):").pack()
+history_file_entry = tk.Entry(root)
+history_file_entry.pack()
+
+tk.Label(root, text="Animation Frames:").pack()
+frames_entry = tk.Entry(root)
+frames_entry.pack()
+frames_entry.insert(0, "200")
+
+tk.Label(root, text="Frames per Second:").pack()
+fps_entry = tk.Entry(root)
+fps_entry.pack()
+fps_entry.insert(0, "20")
+
+tk.Label(root, text="Export File (.mp4/.gif):").pack()
+export_entry = tk.Entry(root)
+export_entry.pack()
+
 ttk.Button(root, text="Run Simulation", command=animate_heat).pack()
+ttk.Button(root, text="Export Animation", command=export_animation).pack()
+export_label = tk.Label(root, text="")
+export_label.pack()
+ttk.Button(root, text="Run to Steady State", command=run_to_steady_state).pack()
+steady_label = tk.Label(root, text="")
+steady_label.pack()
 root.mainloop()
\ No newline at end of file
@@ -2,38 +2,29 @@ import numpy as np
 import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import ttk
-
-# Heat Exchanger Effectiveness Calculation
-def effectiveness(Cr, NTU, type):
-    if type == 'Parallel':
-        return (1 - np.exp(-NTU * (1 + Cr))) / (1 + Cr)
-    elif type == 'Counterflow':
-        return (1 - np.exp(-NTU * (1 - Cr))) / (1 - Cr * np.exp(-NTU * (1 - Cr)))
-    elif type == 'Crossflow':
-        return 1 - np.exp(-NTU * (1 + Cr))
-    else:
-        return None
+from heat_exchanger_ntu import Flow, effectiveness
 
 # Plot Temperature Distribution for all types
 def plot_temperature(T_hot_in, T_cold_in, C_hot, C_cold):
     global result_label  # Make sure result_label is accessible
     
     NTU = np.linspace(0, 10, 100)
-    Cr = C_cold / C_hot if C_hot >= C_cold else C_hot / C_cold
+    C_min, C_max = min(C_hot, C_cold), max(C_hot, C_cold)
+    Cr = C_min / C_max
     
-    types = ['Parallel', 'Counterflow', 'Crossflow']
     plt.figure(figsize=(8, 6))
     
     final_temperatures = {}
     
-    for type in types:
-        effectiveness_values = [effectiveness(Cr, ntu, type) for ntu in NTU]
-        T_hot_out = T_hot_in - np.array(effectiveness_values) * (T_hot_in - T_cold_in)
-        T_cold_out = T_cold_in + np.array(effectiveness_values) * (T_hot_in - T_cold_in) * (C_hot / C_cold)
-        plt.plot(NTU, T_hot_out, label=f'Hot Stream {type}')
-        plt.plot(NTU, T_cold_out, label=f'Cold Stream {type}', linestyle='dashed')
+    for flow in Flow:
+        # One array call per configuration; the heat rate is q = ε Cmin (T_hot_in - T_cold_in)
+        q = effectiveness(Cr, NTU, flow) * C_min * (T_hot_in - T_cold_in)
+        T_hot_out = T_hot_in - q / C_hot
+        T_cold_out = T_cold_in + q / C_cold
+        plt.plot(NTU, T_hot_out, label=f'Hot Stream {flow.value}')
+        plt.plot(NTU, T_cold_out, label=f'Cold Stream {flow.value}', linestyle='dashed')
         
-        final_temperatures[type] = (T_hot_out[-1], T_cold_out[-1])
+        final_temperatures[flow.value] = (T_hot_out[-1], T_cold_out[-1])
     
     plt.xlabel('NTU')
     plt.ylabel('Temperature (°C)')
@@ -1,56 +1,38 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from beam_fem import cantilever_deflection, natural_modes, solve_beam, tip_load
 
 # Beam properties
 E = 200e9  # Young's modulus (Pa)
 I = 8.333e-6  # Moment of inertia (m^4)
 L = 1.0  # Length of beam (m)
 P = 1000  # Load at free end (N)
+rho = 7850  # Density (kg/m^3)
+A = 0.01  # Cross-section area (m^2), 100 mm × 100 mm square
 num_elements = 20  # Increased number of elements for better resolution
+# Round-off grows with the mesh: beam_fem refuses more than MAX_ELEMENTS (5000)
+# elements unless allow_inaccurate=True is passed, since from about 10⁴ on the
+# deflections are meaningless
 num_nodes = num_elements + 1
 
-# Element length
-le = L / num_elements
+# Assemble the banded global stiffness matrix (2 DOF per node) and solve
+# Cantilever: fix displacement and rotation at node 0, load at last node in vertical direction
+y_displacements, rotations = solve_beam(L, E, I, num_elements, tip_load(num_elements, P), fixed_dofs=(0, 1))
 
-# Global stiffness matrix (2 DOF per node)
-K = np.zeros((2 * num_nodes, 2 * num_nodes))
-
-# Assemble the global stiffness matrix
-for i in range(num_elements):
-    k_local = (E * I / le**3) * np.array([
-        [12, 6*le, -12, 6*le],
-        [6*le, 4*le**2, -6*le, 2*le**2],
-        [-12, -6*le, 12, -6*le],
-        [6*le, 2*le**2, -6*le, 4*le**2]
-    ])
-
-    node1 = i * 2
-    node2 = node1 + 2
-    K[node1:node2+2, node1:node2+2] += k_local  # Correct indexing
-
-# Apply boundary conditions (cantilever: fix displacement and rotation at node 0)
-K_reduced = K[2:, 2:]  # Removing first two rows and columns (fixed DOFs)
-
-# Load vector
-F = np.zeros(2 * num_nodes)
-F[-2] = P  # Apply load at last node in vertical direction
-
-# Solve for deflection
-F_reduced = F[2:]  # Adjusting for removed DOFs
-displacements = np.linalg.solve(K_reduced, F_reduced)
-displacements = np.insert(displacements, 0, [0, 0])  # Fixed end (zero displacement & rotation)
-
-# Extract vertical deflection only
-y_displacements = displacements[::2]  # Only take y-direction displacements
+# Lowest natural frequencies of the same beam (sparse shift-invert eigen-solve)
+frequencies, mode_shapes, _ = natural_modes(L, E, I, rho, A, num_elements, num_modes=3)
+print("Natural frequencies:", ", ".join(f"{f:.1f} Hz" for f in frequencies))
 
 # Plot results
 x = np.linspace(0, L, num_nodes)
+error = np.max(np.abs(y_displacements - cantilever_deflection(x, L, E, I, P)))
+print(f"Max nodal deviation from analytical solution: {error * 1e3:.3e} mm")
 plt.figure(figsize=(10, 6))
 plt.plot(x, y_displacements * 1e3, marker="o", linestyle="-", color="b", label="FEA Deflection")
 
 # Analytical solution (for validation)
 x_analytical = np.linspace(0, L, 100)
-y_analytical = (-P * x_analytical**3) / (6 * E * I) * (3 * L - x_analytical)
+y_analytical = cantilever_deflection(x_analytical, L, E, I, P)
 plt.plot(x_analytical, y_analytical * 1e3, linestyle="--", color="r", label="Analytical Solution")
 
 # Enhancing the graph
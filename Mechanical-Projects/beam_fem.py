@@ -0,0 +1,220 @@
+"""
+Banded finite element model of an Euler-Bernoulli beam.
+
+Each node of a beam only couples to its neighbours, so instead of a dense
+(2*num_nodes)² stiffness matrix the global matrix has a half-bandwidth of 3
+and needs only 4 × 2*num_nodes numbers. This module
+assembles all elements in one vectorized pass directly into LAPACK's upper
+banded storage, ab[3 + i - j, j] = K[i, j], and solves with a banded Cholesky
+factorisation. Memory and time are both O(num_elements). BeamModel keeps the
+factorisation, so further load cases cost one back-substitution each.
+natural_modes adds the consistent mass matrix in sparse form and finds only
+the lowest vibration modes.
+
+Note on very fine meshes: the condition number of the beam stiffness matrix
+grows like num_elements⁴, whatever the solver (dense, banded or sparse LU all
+behave alike). In double precision the deflection of the cantilever in
+beam_deflection.py is accurate to about 1e-12 with 20 elements and 2e-5 with
+1000 (2e-3 with 5000), but is dominated by round-off from about 10⁴ elements
+on. Meshes finer than MAX_ELEMENTS therefore raise a ValueError unless the
+caller passes allow_inaccurate=True; they still assemble and solve in linear
+time, but their answers are not trustworthy.
+
+Degrees of freedom are ordered [w0, θ0, w1, θ1, ...] (deflection, rotation).
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import cho_solve_banded, cholesky_banded
+from scipy.sparse.linalg import eigsh
+
+BANDWIDTH = 3  # Number of super-diagonals of the beam stiffness matrix
+MAX_ELEMENTS = 5000  # Finest mesh whose round-off error stays below about 1e-3
+
+
+def check_mesh(num_elements, allow_inaccurate=False):
+    """Raises a ValueError for meshes finer than MAX_ELEMENTS, unless allow_inaccurate is set."""
+    if num_elements > MAX_ELEMENTS and not allow_inaccurate:
+        raise ValueError(f"{num_elements} elements exceed MAX_ELEMENTS = {MAX_ELEMENTS}: round-off "
+                         "dominates the solution; pass allow_inaccurate=True to solve anyway")
+
+
+def element_lengths(L, num_elements):
+    """Lengths of num_elements equal elements over a beam of length L."""
+    return np.full(num_elements, L / num_elements)
+
+
+def element_stiffness(EI, le):
+    """Stacked 4×4 element stiffness matrices for arrays of EI and element length."""
+    EI, le = np.broadcast_arrays(np.asarray(EI, dtype=float), np.asarray(le, dtype=float))
+    one = np.ones_like(le)
+    k = np.array([
+        [12*one, 6*le, -12*one, 6*le],
+        [6*le, 4*le**2, -6*le, 2*le**2],
+        [-12*one, -6*le, 12*one, -6*le],
+        [6*le, 2*le**2, -6*le, 4*le**2]
+    ])
+    return np.moveaxis(k * (EI / le**3), -1, 0)
+
+
+def element_mass(rhoA, le):
+    """Stacked 4×4 consistent mass matrices for arrays of mass per length ρA and element length."""
+    rhoA, le = np.broadcast_arrays(np.asarray(rhoA, dtype=float), np.asarray(le, dtype=float))
+    one = np.ones_like(le)
+    m = np.array([
+        [156*one, 22*le, 54*one, -13*le],
+        [22*le, 4*le**2, 13*le, -3*le**2],
+        [54*one, 13*le, 156*one, -22*le],
+        [-13*le, -3*le**2, -22*le, 4*le**2]
+    ])
+    return np.moveaxis(m * (rhoA * le / 420), -1, 0)
+
+
+def assemble_sparse(k_elements):
+    """Assembles stacked element matrices into a sparse CSC matrix (2*num_nodes)²."""
+    num_elements = len(k_elements)
+    dofs = 2 * np.arange(num_elements)[:, None] + np.arange(4)
+    rows = np.broadcast_to(dofs[:, :, None], k_elements.shape)
+    cols = np.broadcast_to(dofs[:, None, :], k_elements.shape)
+    n = 2 * (num_elements + 1)
+    return sparse.coo_matrix((k_elements.ravel(), (rows.ravel(), cols.ravel())), shape=(n, n)).tocsc()
+
+
+def assemble_banded(k_elements):
+    """
+    Assembles stacked element matrices into upper banded storage (4, 2*num_nodes).
+
+    Element e owns DOFs 2e..2e+3, so entry (a, b) of every element lands on
+    the same band row at a stride of 2 columns and can be added with one slice.
+    """
+    num_elements = len(k_elements)
+    ab = np.zeros((BANDWIDTH + 1, 2 * (num_elements + 1)))
+    for a in range(4):
+        for b in range(a, 4):
+            ab[BANDWIDTH + a - b, b:b + 2 * num_elements:2] += k_elements[:, a, b]
+    return ab
+
+
+def apply_fixed_dofs(ab, fixed_dofs):
+    """
+    Constrains DOFs to zero by replacing their rows and columns with the identity.
+
+    This keeps the band structure (unlike deleting rows and columns) and works
+    for any support layout.
+    """
+    n = ab.shape[1]
+    for i in fixed_dofs:
+        ab[:, i] = 0
+        for j in range(i + 1, min(i + BANDWIDTH + 1, n)):
+            ab[BANDWIDTH + i - j, j] = 0
+        ab[BANDWIDTH, i] = 1
+    return ab
+
+
+def tip_load(num_elements, P):
+    """Load vector with a vertical point load P at the last node."""
+    F = np.zeros(2 * (num_elements + 1))
+    F[-2] = P
+    return F
+
+
+def load_cases(num_elements, nodes, P):
+    """
+    Load matrix with one column per case, each a vertical point load.
+
+    :param nodes: Loaded node of every case
+    :param P: Load of every case (scalar or one per case)
+    :return: Array of shape (2*(num_elements+1), num_cases)
+    """
+    nodes = np.asarray(nodes)
+    F = np.zeros((2 * (num_elements + 1), len(nodes)))
+    F[2 * nodes, np.arange(len(nodes))] = P
+    return F
+
+
+class BeamModel:
+    """
+    Beam of equal elements whose reduced stiffness matrix is factorised once.
+
+    Every later solve is one banded back-substitution, and many load cases can
+    be solved together by passing one load vector per column. Meshes finer
+    than MAX_ELEMENTS need allow_inaccurate=True.
+    """
+
+    def __init__(self, L, E, I, num_elements, fixed_dofs=(0, 1), allow_inaccurate=False):
+        check_mesh(num_elements, allow_inaccurate)
+        self.L = L
+        self.num_elements = num_elements
+        self.fixed_dofs = list(fixed_dofs)
+        ab = assemble_banded(element_stiffness(np.asarray(E) * np.asarray(I), element_lengths(L, num_elements)))
+        apply_fixed_dofs(ab, self.fixed_dofs)
+        self.factor = cholesky_banded(ab)
+
+    @property
+    def x(self):
+        """Node positions along the beam."""
+        return np.linspace(0, self.L, self.num_elements + 1)
+
+    def solve(self, F):
+        """
+        Solves K u = F for one load vector or a matrix of load cases.
+
+        :param F: Load vector (2*num_nodes,) or matrix (2*num_nodes, num_cases)
+        :return: (deflections, rotations), each (num_nodes,) or (num_nodes, num_cases)
+        """
+        F = np.array(F, dtype=float)
+        F[self.fixed_dofs] = 0
+        u = cho_solve_banded((self.factor, False), F)
+        return u[::2], u[1::2]
+
+
+def solve_beam(L, E, I, num_elements, F, fixed_dofs=(0, 1), allow_inaccurate=False):
+    """
+    Solves K u = F for a beam of equal elements.
+
+    :param L: Length of beam (m)
+    :param E, I: Young's modulus (Pa) and moment of inertia (m^4), scalars or one per element
+    :param num_elements: Number of elements
+    :param F: Load vector of length 2*(num_elements+1), or one column per load case
+    :param fixed_dofs: Constrained DOFs, (0, 1) clamps node 0 (cantilever)
+    :param allow_inaccurate: Solve meshes finer than MAX_ELEMENTS instead of raising a ValueError
+    :return: (deflections, rotations) at every node
+    """
+    return BeamModel(L, E, I, num_elements, fixed_dofs, allow_inaccurate).solve(F)
+
+
+def natural_modes(L, E, I, rho, A, num_elements, num_modes=5, fixed_dofs=(0, 1), allow_inaccurate=False):
+    """
+    Lowest natural frequencies and mode shapes of the beam.
+
+    K and the consistent mass matrix M are assembled in sparse form, the fixed
+    DOFs are removed, and only the lowest num_modes eigenpairs of K φ = ω² M φ
+    are found with shift-invert Lanczos (eigsh about σ = 0), so no dense
+    eigen-decomposition is ever formed. The lowest modes converge with a few
+    hundred elements; the shift-invert solves share the round-off limit of
+    the static model described above (4e-7 error at 100 elements, 6e-5 at
+    3000, unreliable beyond 10⁴).
+
+    :param rho, A: Density (kg/m^3) and cross-section area (m^2), scalars or one per element
+    :param allow_inaccurate: Solve meshes finer than MAX_ELEMENTS instead of raising a ValueError
+    :return: (frequencies in Hz, deflection shapes (num_nodes, num_modes), rotation shapes)
+    """
+    check_mesh(num_elements, allow_inaccurate)
+    le = element_lengths(L, num_elements)
+    K = assemble_sparse(element_stiffness(np.asarray(E) * np.asarray(I), le))
+    M = assemble_sparse(element_mass(np.asarray(rho) * np.asarray(A), le))
+    free = np.setdiff1d(np.arange(K.shape[0]), fixed_dofs)
+    K = K[free][:, free]
+    M = M[free][:, free]
+
+    eigenvalues, vectors = eigsh(K, k=num_modes, M=M, sigma=0, which="LM")
+    order = np.argsort(eigenvalues)
+    shapes = np.zeros((2 * (num_elements + 1), num_modes))
+    shapes[free] = vectors[:, order]
+    frequencies = np.sqrt(np.abs(eigenvalues[order])) / (2 * np.pi)
+    return frequencies, shapes[::2], shapes[1::2]
+
+
+def cantilever_deflection(x, L, E, I, P):
+    """Analytical deflection of a cantilever with tip load P: P x² (3L - x) / (6EI)."""
+    return P * x**2 * (3 * L - x) / (6 * E * I)
@@ -0,0 +1,251 @@
+"""
+Exact shear force and bending moment diagrams of a simply supported beam.
+
+Supports are at x = 0 (A) and x = L (B). Loads are given as
+    point_loads: [(a, P), ...]           downward point load P at x = a
+    udls:        [(start, end, w), ...]  downward uniform load w per metre
+    moments:     [(c, M0), ...]          clockwise applied couple M0 at x = c
+which is the sign convention of sfd_bmd.py: upward reactions, sagging moment
+and V = Ra just right of support A are positive.
+
+By superposition the diagrams are piecewise polynomials between the sorted
+load positions (breakpoints): V is linear and M quadratic on every segment.
+ShearMomentDiagram stores, for every segment, the values just right of its
+left breakpoint and the distributed load on it, built with cumulative sums
+after one sort of the k load positions (O(k log k)). The diagrams can then be
+evaluated exactly on any grid, and their extremes are found analytically at
+the breakpoints and at the points of zero shear, independent of any sampling.
+
+For moving loads (cranes, conveyors, vehicles) moving_load_envelope rolls a
+train of axle loads across the span using the closed-form influence lines of
+shear and moment, and returns envelope curves with their governing positions.
+"""
+
+import numpy as np
+
+
+def _as_rows(loads, width):
+    """Loads as a float array of shape (k, width), empty if there are none."""
+    return np.asarray(loads if loads is not None and len(loads) else np.empty((0, width)),
+                      dtype=float).reshape(-1, width)
+
+
+def _sum_at(index, values, n):
+    """Adds values into n bins (float even when there are no values)."""
+    return np.bincount(index, values, n).astype(float)
+
+
+def support_reactions(L, point_loads=(), udls=(), moments=()):
+    """Returns (Ra, Rb) of the simply supported beam from the equilibrium equations."""
+    point = _as_rows(point_loads, 2)
+    udl = _as_rows(udls, 3)
+    couple = _as_rows(moments, 2)
+    udl_total = udl[:, 2] * (udl[:, 1] - udl[:, 0])
+    total = point[:, 1].sum() + udl_total.sum()
+    # Moments about A (anticlockwise positive): Rb L = Σ P a + Σ W x̄ + Σ M0
+    Rb = (point[:, 1] @ point[:, 0] + udl_total @ (udl[:, 0] + udl[:, 1]) / 2 + couple[:, 1].sum()) / L
+    return total - Rb, Rb
+
+
+class ShearMomentDiagram:
+    """Piecewise-polynomial shear force V(x) and bending moment M(x) of a loaded beam."""
+
+    def __init__(self, L, point_loads=(), udls=(), moments=()):
+        point = _as_rows(point_loads, 2)
+        udl = _as_rows(udls, 3)
+        couple = _as_rows(moments, 2)
+        for positions in (point[:, 0], udl[:, 0], udl[:, 1], couple[:, 0]):
+            if np.any((positions < 0) | (positions > L)):
+                raise ValueError("Load positions must lie on the beam, 0 <= x <= L")
+        if np.any(udl[:, 1] < udl[:, 0]):
+            raise ValueError("Each UDL needs start <= end")
+
+        self.L = L
+        self.Ra, self.Rb = support_reactions(L, point, udl, couple)
+
+        # Breakpoints and the loads acting at each of them
+        self.breaks, inverse = np.unique(
+            np.concatenate(([0.0, L], point[:, 0], udl[:, 0], udl[:, 1], couple[:, 0])), return_inverse=True)
+        n_point, n_udl = len(point), len(udl)
+        at = np.split(inverse[2:], np.cumsum([n_point, n_udl, n_udl]))
+        n = len(self.breaks)
+        shear_jump = -_sum_at(at[0], point[:, 1], n)
+        shear_jump[0] += self.Ra
+        moment_jump = _sum_at(at[3], couple[:, 1], n)
+        load_change = _sum_at(at[1], udl[:, 2], n) - _sum_at(at[2], udl[:, 2], n)
+
+        # Segment k runs from breaks[k] to breaks[k+1] with distributed load q[k]
+        h = np.diff(self.breaks)
+        self.q = np.cumsum(load_change)[:-1]
+        # Values just right of each breakpoint: V drops by q h over a segment, M grows by ∫V
+        dV = shear_jump
+        dV[1:] -= self.q * h
+        self.V = np.cumsum(dV)
+        dM = moment_jump
+        dM[1:] += self.V[:-1] * h - self.q * h**2 / 2
+        self.M = np.cumsum(dM)
+
+    def _segments(self, x):
+        """Segment index of every x (points on a breakpoint belong to the right-hand segment)."""
+        return np.clip(np.searchsorted(self.breaks, x, side="right") - 1, 0, len(self.q) - 1)
+
+    def shear(self, x):
+        """V(x) on any grid of positions (right-hand value at a point load)."""
+        x = np.asarray(x, dtype=float)
+        k = self._segments(x)
+        return self.V[k] - self.q[k] * (x - self.breaks[k])
+
+    def moment(self, x):
+        """M(x) on any grid of positions (right-hand value at an applied couple)."""
+        x = np.asarray(x, dtype=float)
+        k = self._segments(x)
+        s = x - self.breaks[k]
+        return self.M[k] + self.V[k] * s - self.q[k] * s**2 / 2
+
+    def plot_points(self, num=200):
+        """Positions and values for plotting: a uniform grid plus both sides of every jump."""
+        x = np.union1d(np.linspace(0, self.L, num), self.breaks)
+        x_left = self.breaks[1:]
+        xs = np.concatenate((x, x_left))
+        V = np.concatenate((self.shear(x), self.V[:-1] - self.q * np.diff(self.breaks)))
+        M = np.concatenate((self.moment(x), self._left_moments()))
+        # At a breakpoint the left-hand value is drawn before the right-hand one
+        order = np.lexsort((np.r_[np.ones(len(x)), np.zeros(len(x_left))], xs))
+        return xs[order], V[order], M[order]
+
+    def _left_moments(self):
+        """M just left of breaks[1:]."""
+        h = np.diff(self.breaks)
+        return self.M[:-1] + self.V[:-1] * h - self.q * h**2 / 2
+
+    def extremes(self):
+        """
+        Exact extreme values of the diagrams.
+
+        :return: dict with "max_shear", "min_shear", "max_moment", "min_moment" as (value, x)
+        """
+        h = np.diff(self.breaks)
+        # Shear is linear on each segment: extremes sit at segment ends (both sides of a jump)
+        V_x = np.concatenate((self.breaks[:-1], self.breaks[1:]))
+        V_val = np.concatenate((self.V[:-1], self.V[:-1] - self.q * h))
+        # Moment: segment ends plus interior points of zero shear
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(self.q != 0, self.V[:-1] / self.q, -1.0)
+        inside = (s > 0) & (s < h)
+        M_x = np.concatenate((self.breaks[:-1], self.breaks[1:], self.breaks[:-1][inside] + s[inside]))
+        M_val = np.concatenate((self.M[:-1], self._left_moments(), self.moment(M_x[2 * len(h):])))
+        return {
+            "max_shear": (V_val.max(), V_x[V_val.argmax()]),
+            "min_shear": (V_val.min(), V_x[V_val.argmin()]),
+            "max_moment": (M_val.max(), M_x[M_val.argmax()]),
+            "min_moment": (M_val.min(), M_x[M_val.argmin()]),
+        }
+
+
+def shear_influence(L, x, xi, load_at_section="left", out=None):
+    """
+    Influence line of V at sections x for a unit load at positions xi (broadcast).
+
+    A load exactly at the section counts as left of it (V is the right-hand
+    value, as in ShearMomentDiagram) unless load_at_section="right". The
+    result is written into out if given.
+    """
+    x, xi = np.asarray(x, dtype=float), np.asarray(xi, dtype=float)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(x.shape, xi.shape))
+    (np.greater_equal if load_at_section == "right" else np.greater)(xi, x, out=out)
+    out -= xi / L
+    out *= (xi >= 0) & (xi <= L)
+    return out
+
+
+def moment_influence(L, x, xi, out=None):
+    """Influence line of M at sections x for a unit load at positions xi (broadcast), written into out if given."""
+    x, xi = np.asarray(x, dtype=float), np.asarray(xi, dtype=float)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(x.shape, xi.shape))
+    # x (L - ξ)/L for a load right of the section, ξ (L - x)/L left of it
+    np.multiply(x, (L - xi) / L, out=out)
+    np.multiply(xi, (L - x) / L, out=out, where=xi <= x)
+    out *= (xi >= 0) & (xi <= L)
+    return out
+
+
+def _train_responses(L, x, xi, axle_loads):
+    """
+    V and M at sections x for axle positions xi[j] (broadcastable to sections × positions).
+
+    Returns V with an axle on the section counted on its left, V with it
+    counted on its right, and M. One axle at a time, its influence lines are
+    evaluated into a work array allocated once and added, times its load, in place.
+    """
+    sections = x[:, None]
+    shape = (len(x), xi.shape[-1])
+    V_left, V_right, M = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    line = np.empty(shape)
+    for P, xi_j in zip(axle_loads, xi):
+        V_left += np.multiply(shear_influence(L, sections, xi_j, out=line), P, out=line)
+        V_right += np.multiply(shear_influence(L, sections, xi_j, "right", out=line), P, out=line)
+        M += np.multiply(moment_influence(L, sections, xi_j, out=line), P, out=line)
+    return V_left, V_right, M
+
+
+def moving_load_envelope(L, axle_loads, axle_offsets, x=None, positions=None):
+    """
+    Shear and moment envelopes of a train of axle loads rolling across the span.
+
+    Axle j carries the downward load axle_loads[j] at axle_offsets[j] behind the
+    lead axle. The influence lines of shear and moment (shear_influence,
+    moment_influence) are evaluated axle by axle in one batch of
+    (sections × positions) array operations and added in place:
+        V(x) = Σ P_j η_V(x, ξ_j),   M(x) = Σ P_j η_M(x, ξ_j)
+    The responses are piecewise linear in the lead position, with kinks or jumps
+    only where an axle is on the section or enters/leaves the span. Those
+    critical positions are added to the batch, so the envelopes are exact and do
+    not depend on the position grid.
+
+    :param x: Sections where envelopes are wanted (default 201 points over the span)
+    :param positions: Extra lead-axle positions to evaluate (default: 1001 points from
+                      the moment the train enters until it has left the span)
+    :return: dict with x and, for "max_shear", "min_shear", "max_moment" and
+             "min_moment", a pair (envelope values, governing lead-axle position)
+    """
+    axle_loads = np.asarray(axle_loads, dtype=float)
+    axle_offsets = np.asarray(axle_offsets, dtype=float)
+    x = np.linspace(0, L, 201) if x is None else np.asarray(x, dtype=float)
+    if positions is None:
+        positions = np.linspace(0, L + axle_offsets.max(), 1001)
+
+    # Lead positions: shared by every section (grid, axles entering and leaving the
+    # span) and, per section, each axle placed exactly on it
+    shared = np.concatenate((positions, axle_offsets, L + axle_offsets))
+    critical = x[:, None] + axle_offsets[None, :]
+    V_shared, V_shared_right, M_shared = _train_responses(L, x, shared[None, :] - axle_offsets[:, None, None],
+                                                          axle_loads)
+    # Offset differences keep the on-section axle exactly on x
+    V_crit, V_crit_right, M_crit = _train_responses(
+        L, x, x[:, None] + (axle_offsets[None, :] - axle_offsets[:, None, None]), axle_loads)
+
+    shared_lead = np.broadcast_to(shared, (len(x), len(shared)))
+    shear_blocks = [(V_shared, shared_lead), (V_crit, critical),
+                    (V_shared_right, shared_lead), (V_crit_right, critical)]
+    moment_blocks = [(M_shared, shared_lead), (M_crit, critical)]
+    rows = np.arange(len(x))
+
+    def governing(blocks, pick):
+        """Best value per section over all blocks and the lead position giving it."""
+        best = []
+        for values, lead in blocks:
+            k = pick(values, axis=1)
+            best.append((values[rows, k], lead[rows, k]))
+        values = np.array([b[0] for b in best])
+        k = pick(values, axis=0)
+        return values[k, rows], np.array([b[1] for b in best])[k, rows]
+
+    return {
+        "x": x,
+        "max_shear": governing(shear_blocks, np.argmax),
+        "min_shear": governing(shear_blocks, np.argmin),
+        "max_moment": governing(moment_blocks, np.argmax),
+        "min_moment": governing(moment_blocks, np.argmin),
+    }
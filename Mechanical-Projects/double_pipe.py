@@ -0,0 +1,157 @@
+"""
+Counterflow double-pipe heat exchanger as a two-point boundary-value problem.
+
+The hot fluid enters at x = 0 and the cold fluid at x = L, flowing the other
+way. With heat capacity rates C = m cp and the heat transfer perimeter P,
+
+    dT_hot/dx = -U P (T_hot - T_cold) / C_hot
+    dT_cold/dx = -U P (T_hot - T_cold) / C_cold
+
+so the difference ΔT decays (or grows) exponentially at the rate
+k = U P (1/C_hot - 1/C_cold). counterflow_profile is that closed-form solution
+for constant U and cp. Its outlets match the effectiveness-NTU relation of
+heat_exchanger_ntu, and it is written with exprel so that balanced flow
+(C_hot = C_cold, linear profiles) is not a special case.
+
+solve_counterflow handles cp and U that depend on temperature. Properties
+are frozen per cell at the cell mean temperatures, and each cell is then
+solved exactly. For frozen properties the outlets are linear in the unknown
+inlet-end difference ΔT(0), so one cumulative product and sum along the cells
+fixes it without iteration (linear shooting). The property freeze is updated
+by Picard iteration. Every input broadcasts, so a batch of cases is solved
+by the same array operations. For constant properties the result equals the
+closed form at any grid size.
+"""
+
+import time
+
+import numpy as np
+from scipy.special import exprel
+
+
+def counterflow_profile(x, L, T_hot_in, T_cold_in, C_hot, C_cold, UA):
+    """
+    Closed-form temperatures of a counterflow exchanger with constant U and cp.
+
+    :param x: Positions from the hot inlet (broadcast with the other inputs)
+    :param L: Length (m)
+    :param C_hot, C_cold: Heat capacity rates m cp (W/K)
+    :param UA: Overall conductance U P L (W/K)
+    :return: (T_hot, T_cold) at x
+    """
+    K = UA * (1 / C_hot - 1 / C_cold)
+    # ΔT(0) from the cold inlet condition T_cold(L) = T_cold_in
+    dT0 = (T_hot_in - T_cold_in) / (UA / C_hot * exprel(-K) + np.exp(-K))
+    s = np.asarray(x, dtype=float) / L
+    T_hot = T_hot_in - dT0 * UA / C_hot * s * exprel(-K * s)
+    return T_hot, T_hot - dT0 * np.exp(-K * s)
+
+
+def counterflow_outlets(T_hot_in, T_cold_in, C_hot, C_cold, UA):
+    """Closed-form (T_hot_out, T_cold_out) for constant U and cp, for arrays of cases."""
+    T_hot_out, _ = counterflow_profile(1, 1, T_hot_in, T_cold_in, C_hot, C_cold, UA)
+    _, T_cold_out = counterflow_profile(0, 1, T_hot_in, T_cold_in, C_hot, C_cold, UA)
+    return T_hot_out, T_cold_out
+
+
+def _property(value, *T):
+    """A property per case (broadcast over the cells), or a callable evaluated at the cell temperatures."""
+    return value(*T) if callable(value) else np.asarray(value, dtype=float)[..., None]
+
+
+def _march(a_hot, a_cold, T_hot_in, T_cold_in):
+    """
+    Node temperatures for per-cell transfer numbers a = U P dx / C (last axis: cells).
+
+    Within cell i, ΔT falls by the factor e^(-k_i), k_i = a_hot,i - a_cold,i,
+    and T_hot by a_hot,i exprel(-k_i) ΔT_i. Both are linear in ΔT(0), which the
+    cold inlet condition then gives directly.
+    """
+    k = a_hot - a_cold
+    ratio = np.cumprod(np.exp(-k), axis=-1)  # ΔT at the end of each cell / ΔT(0)
+    ratio = np.concatenate((np.ones_like(ratio[..., :1]), ratio), axis=-1)
+    drop = a_hot * exprel(-k) * ratio[..., :-1]  # Hot drop of each cell / ΔT(0)
+    hot_drop = np.concatenate((np.zeros_like(drop[..., :1]), np.cumsum(drop, axis=-1)), axis=-1)
+
+    dT0 = (T_hot_in - T_cold_in) / (hot_drop[..., -1:] + ratio[..., -1:])
+    T_hot = T_hot_in - dT0 * hot_drop
+    return T_hot, T_hot - dT0 * ratio
+
+
+def solve_counterflow(L, perimeter, T_hot_in, T_cold_in, m_hot, m_cold, cp_hot, cp_cold, U, N=100,
+                      tol=1e-4, max_iter=50):
+    """
+    Temperature profiles of a counterflow exchanger, for one case or a batch.
+
+    :param L: Length (m)
+    :param perimeter: Heat transfer perimeter, π D_inner for a double pipe (m)
+    :param T_hot_in, T_cold_in: Inlet temperatures; the cold fluid enters at x = L (°C)
+    :param m_hot, m_cold: Mass flow rates (kg/s)
+    :param cp_hot, cp_cold: Specific heats (J/kg.K), per case or callables cp(T)
+    :param U: Overall heat transfer coefficient (W/m².K), per case or callable U(T_hot, T_cold)
+    :param N: Number of cells along the exchanger (each cell is solved exactly, so
+              with callable properties about 20 cells already agree to 1e-4 °C)
+    :param tol: Picard tolerance on the cell temperatures (°C), used with callable properties; each
+                pass costs about one constant-property solve and gains about one decimal
+    :return: (x, T_hot, T_cold), each with N + 1 nodes on the last axis
+    """
+    if N < 1:
+        raise ValueError("N must be at least one cell")
+    L, perimeter, T_hot_in, T_cold_in, m_hot, m_cold = (
+        np.asarray(v, dtype=float)[..., None] for v in (L, perimeter, T_hot_in, T_cold_in, m_hot, m_cold))
+    variable = any(callable(p) for p in (cp_hot, cp_cold, U))
+    cases = [np.shape(p) for p in (cp_hot, cp_cold, U) if not callable(p)]
+    shape = np.broadcast_shapes(L.shape[:-1], perimeter.shape[:-1], T_hot_in.shape[:-1], T_cold_in.shape[:-1],
+                                m_hot.shape[:-1], m_cold.shape[:-1], *cases) + (N,)
+    dx = L / N
+
+    # First pass: properties at the inlet temperatures
+    T_hot_mid = np.broadcast_to(T_hot_in, shape)
+    T_cold_mid = np.broadcast_to(T_cold_in, shape)
+    for _ in range(max_iter if variable else 1):
+        UPdx = _property(U, T_hot_mid, T_cold_mid) * perimeter * dx
+        a_hot = np.broadcast_to(UPdx / (m_hot * _property(cp_hot, T_hot_mid)), shape)
+        a_cold = np.broadcast_to(UPdx / (m_cold * _property(cp_cold, T_cold_mid)), shape)
+        T_hot, T_cold = _march(a_hot, a_cold, T_hot_in, T_cold_in)
+        new_hot = (T_hot[..., 1:] + T_hot[..., :-1]) / 2
+        new_cold = (T_cold[..., 1:] + T_cold[..., :-1]) / 2
+        change = max(np.abs(new_hot - T_hot_mid).max(), np.abs(new_cold - T_cold_mid).max())
+        T_hot_mid, T_cold_mid = new_hot, new_cold
+        if change <= tol:
+            break
+
+    x = L * np.linspace(0, 1, N + 1)
+    return x, T_hot, T_cold
+
+
+def benchmark(num_cases=100_000, N=20):
+    """Prints the time per case of both paths and their agreement with ε-NTU."""
+    from heat_exchanger_ntu import Flow, effectiveness
+
+    rng = np.random.default_rng(0)
+    C_hot = rng.uniform(500, 5000, num_cases)
+    C_cold = rng.uniform(500, 5000, num_cases)
+    UA = rng.uniform(100, 20_000, num_cases)
+
+    start = time.perf_counter()
+    T_hot_out, T_cold_out = counterflow_outlets(150.0, 20.0, C_hot, C_cold, UA)
+    closed_us = (time.perf_counter() - start) / num_cases * 1e6
+
+    C_min, C_max = np.minimum(C_hot, C_cold), np.maximum(C_hot, C_cold)
+    q = effectiveness(C_min / C_max, UA / C_min, Flow.COUNTERFLOW) * C_min * 130.0
+    ntu_error = max(np.abs(T_hot_out - (150 - q / C_hot)).max(), np.abs(T_cold_out - (20 + q / C_cold)).max())
+
+    # Variable-property path on a smaller batch: cp rising 0.2 %/K with temperature
+    n = num_cases // 10
+    start = time.perf_counter()
+    solve_counterflow(1.0, 1.0, 150.0, 20.0, C_hot[:n] / 4000, C_cold[:n] / 4000,
+                      lambda T: 4000 * (1 + 0.002 * (T - 20)), lambda T: 4000 * (1 + 0.002 * (T - 20)),
+                      UA[:n], N=N)
+    variable_us = (time.perf_counter() - start) / n * 1e6
+
+    print(f"closed form:        {closed_us:8.3f} µs/case, max deviation from ε-NTU {ntu_error:.1e} °C")
+    print(f"variable cp, N={N}:  {variable_us:8.3f} µs/case")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,218 @@
+"""
+Headless design search for counterflow double-pipe heat exchangers.
+
+A design is one combination of the inner and outer pipe diameters, the two
+mass flow rates and U, the inputs of calculate_cfd in project.py. The hot
+fluid runs in the inner pipe and the cold fluid in the annulus. For a
+required duty, each design gets its minimum length in closed form: the
+duty fixes the effectiveness, ntu_from_effectiveness gives the NTU, and
+L = NTU Cmin / (U π D_inner). Designs are then checked against limits on length,
+outer diameter and the pressure drop of either stream.
+
+The candidate grid (the product of the given values) can hold millions of
+designs, so it is never built as a whole:
+  - Infeasible regions are pruned before any work is sent out: pipe pairs that
+    do not fit (D_outer <= D_inner or above the size limit) and flow pairs that
+    cannot reach the duty at any length.
+  - The remaining grid is split into flat index ranges and spread over a
+    process pool. Each worker rebuilds its batch from the indices and
+    evaluates it with array operations. Pressure drop grows with length, so
+    the limits give a largest allowed NTU per design. Designs whose effectiveness
+    at that NTU is below the duty are dropped with a cheap forward evaluation,
+    before the inverse solve.
+  - Workers return only the Pareto front of their batch, and the parent merges
+    the fronts as batches complete.
+
+The front trades length (minimised) against effectiveness and cold outlet
+temperature (both maximised).
+
+Example:
+    front, stats = optimize(duty=50e3, T_hot_in=120, T_cold_in=20,
+                            D_inner=np.linspace(0.01, 0.05, 21), D_outer=np.linspace(0.02, 0.08, 31),
+                            m_hot=np.linspace(0.1, 2, 50), m_cold=np.linspace(0.1, 2, 50),
+                            U=[300, 600, 900], max_dp_hot=50e3, max_dp_cold=50e3, max_length=30)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from heat_exchanger_ntu import Flow, effectiveness, ntu_from_effectiveness
+
+DESIGN_FIELDS = [("D_inner", float), ("D_outer", float), ("m_hot", float), ("m_cold", float), ("U", float),
+                 ("length", float), ("effectiveness", float), ("T_hot_out", float), ("T_cold_out", float),
+                 ("dp_hot", float), ("dp_cold", float)]
+
+# Worker state, set once per process by _init_worker
+_grid = {}
+
+
+def pressure_drop(m, rho, mu, area, D_h, L):
+    """
+    Friction pressure drop (Pa) of a flow through a straight duct.
+
+    Darcy friction factor 64/Re for laminar flow (Re < 2300), Blasius 0.316 Re^-0.25 otherwise.
+
+    :param m: Mass flow rate (kg/s)
+    :param rho, mu: Density (kg/m^3) and dynamic viscosity (Pa.s)
+    :param area, D_h: Flow area (m^2) and hydraulic diameter (m)
+    :param L: Duct length (m)
+    """
+    v = m / (rho * area)
+    Re = rho * v * D_h / mu
+    f = np.where(Re < 2300, 64 / Re, 0.316 * Re**-0.25)
+    return f * L / D_h * rho * v**2 / 2
+
+
+def pareto_mask(objectives, chunk=1024):
+    """
+    Marks the rows of objectives (n, k) that no other row dominates (all objectives minimised).
+
+    Rows are sorted lexicographically so that every row's dominators come
+    before it. They are then checked in chunks against the front found so far
+    and against the earlier rows of their own chunk. Of equal rows, only the
+    first is kept.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    order = np.lexsort(objectives.T[::-1])
+    sorted_obj = objectives[order]
+    keep = np.zeros(len(objectives), dtype=bool)
+    front = sorted_obj[:0]
+    for start in range(0, len(sorted_obj), chunk):
+        index = order[start:start + chunk]
+        block = sorted_obj[start:start + chunk]
+        # Most rows fall to the front already; only the rest are compared pairwise
+        alive = ~np.all(front[:, None, :] <= block[None, :, :], axis=2).any(axis=0)
+        index, block = index[alive], block[alive]
+        within = np.all(block[:, None, :] <= block[None, :, :], axis=2)
+        alive = ~np.triu(within, k=1).any(axis=0)  # Only earlier rows of the chunk count
+        keep[index[alive]] = True
+        front = np.concatenate((front, block[alive]))
+    return keep
+
+
+def _objectives(designs):
+    return np.column_stack((designs["length"], -designs["effectiveness"], -designs["T_cold_out"]))
+
+
+def _init_worker(geometry, flows, U, params):
+    _grid.update(geometry=geometry, flows=flows, U=U, params=params)
+
+
+def _evaluate(start, stop):
+    """Worker: evaluates designs start..stop of the pruned grid, returns (local front, feasible count)."""
+    geometry, flows, U_values, p = _grid["geometry"], _grid["flows"], _grid["U"], _grid["params"]
+    g, f, u = np.unravel_index(np.arange(start, stop), (len(geometry), len(flows), len(U_values)))
+    D_i, D_o = geometry[g].T
+    m_h, m_c = flows[f].T
+    U = U_values[u]
+
+    C_h, C_c = m_h * p["cp_hot"], m_c * p["cp_cold"]
+    C_min, C_max = np.minimum(C_h, C_c), np.maximum(C_h, C_c)
+    dT_max = p["T_hot_in"] - p["T_cold_in"]
+    eps = p["duty"] / (C_min * dT_max)
+    Cr = C_min / C_max
+
+    # Pressure drop per metre of each stream; the limits give the longest allowed pipe
+    inner_area = np.pi * D_i**2 / 4
+    annulus_area = np.pi * (D_o**2 - D_i**2) / 4
+    dp_hot_per_m = pressure_drop(m_h, p["rho_hot"], p["mu_hot"], inner_area, D_i, 1.0)
+    dp_cold_per_m = pressure_drop(m_c, p["rho_cold"], p["mu_cold"], annulus_area, D_o - D_i, 1.0)
+    L_allowed = np.minimum(p["max_length"], np.minimum(p["max_dp_hot"] / dp_hot_per_m,
+                                                       p["max_dp_cold"] / dp_cold_per_m))
+
+    # Bound: the duty must be reachable within the allowed length (forward ε only)
+    UP = U * np.pi * D_i
+    with np.errstate(over="ignore"):
+        reachable = effectiveness(Cr, np.minimum(UP * L_allowed / C_min, 1e9), Flow.COUNTERFLOW) >= eps
+    keep = np.flatnonzero(reachable)
+
+    NTU = ntu_from_effectiveness(eps[keep], Cr[keep], Flow.COUNTERFLOW)
+    length = NTU * C_min[keep] / UP[keep]
+    feasible = np.isfinite(length) & (length <= L_allowed[keep])
+    keep, length = keep[feasible], length[feasible]
+
+    designs = np.empty(len(keep), dtype=DESIGN_FIELDS)
+    designs["D_inner"], designs["D_outer"] = D_i[keep], D_o[keep]
+    designs["m_hot"], designs["m_cold"], designs["U"] = m_h[keep], m_c[keep], U[keep]
+    designs["length"] = length
+    designs["effectiveness"] = eps[keep]
+    designs["T_hot_out"] = p["T_hot_in"] - p["duty"] / C_h[keep]
+    designs["T_cold_out"] = p["T_cold_in"] + p["duty"] / C_c[keep]
+    designs["dp_hot"] = dp_hot_per_m[keep] * length
+    designs["dp_cold"] = dp_cold_per_m[keep] * length
+    return designs[pareto_mask(_objectives(designs))], len(designs)
+
+
+def optimize(duty, T_hot_in, T_cold_in, D_inner, D_outer, m_hot, m_cold, U, cp_hot=4180, cp_cold=4180,
+             rho_hot=1000, mu_hot=1e-3, rho_cold=1000, mu_cold=1e-3, max_length=np.inf,
+             max_outer_diameter=np.inf, max_dp_hot=np.inf, max_dp_cold=np.inf, batch_size=100_000,
+             workers=None, progress=None):
+    """
+    Finds the Pareto front of double-pipe designs that meet the duty within the limits.
+
+    :param duty: Required heat rate (W)
+    :param D_inner, D_outer, m_hot, m_cold, U: Candidate values of each variable (m, kg/s, W/m².K);
+                                               every combination is a design
+    :param cp_hot, cp_cold, rho_hot, mu_hot, rho_cold, mu_cold: Constant fluid properties (SI units)
+    :param max_length, max_outer_diameter: Size limits (m)
+    :param max_dp_hot, max_dp_cold: Pressure drop limits (Pa)
+    :param batch_size: Designs per worker task
+    :param workers: Number of processes (default: one per CPU)
+    :param progress: Optional callback progress(done, total), called after each batch
+    :return: (front, stats). front is a structured array with the fields of DESIGN_FIELDS,
+             sorted by length. stats counts the designs in the grid, pruned by region,
+             feasible, and on the front.
+    """
+    D_inner, D_outer, m_hot, m_cold, U = (np.asarray(v, dtype=float).ravel()
+                                          for v in (D_inner, D_outer, m_hot, m_cold, U))
+    total = len(D_inner) * len(D_outer) * len(m_hot) * len(m_cold) * len(U)
+
+    # Region pruning: pipe pairs that do not fit, flow pairs that cannot reach the duty at any length
+    Di, Do = np.meshgrid(D_inner, D_outer, indexing="ij")
+    fits = (Do > Di) & (Do <= max_outer_diameter)
+    geometry = np.column_stack((Di[fits], Do[fits]))
+    mh, mc = np.meshgrid(m_hot, m_cold, indexing="ij")
+    C_min = np.minimum(mh * cp_hot, mc * cp_cold)
+    reachable = duty < C_min * (T_hot_in - T_cold_in) * effectiveness(
+        np.minimum(mh * cp_hot, mc * cp_cold) / np.maximum(mh * cp_hot, mc * cp_cold), 1e9, Flow.COUNTERFLOW)
+    flows = np.column_stack((mh[reachable], mc[reachable]))
+
+    remaining = len(geometry) * len(flows) * len(U)
+    stats = {"designs": total, "pruned_regions": total - remaining, "feasible": 0, "front": 0}
+    front = np.empty(0, dtype=DESIGN_FIELDS)
+    if remaining == 0:
+        return front, stats
+
+    params = dict(duty=duty, T_hot_in=T_hot_in, T_cold_in=T_cold_in, cp_hot=cp_hot, cp_cold=cp_cold,
+                  rho_hot=rho_hot, mu_hot=mu_hot, rho_cold=rho_cold, mu_cold=mu_cold, max_length=max_length,
+                  max_dp_hot=max_dp_hot, max_dp_cold=max_dp_cold)
+    bounds = [(start, min(start + batch_size, remaining)) for start in range(0, remaining, batch_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(geometry, flows, U, params)) as pool:
+        futures = [pool.submit(_evaluate, start, stop) for start, stop in bounds]
+        for done, future in enumerate(as_completed(futures), 1):
+            local, feasible = future.result()
+            stats["feasible"] += feasible
+            merged = np.concatenate((front, local))
+            front = merged[pareto_mask(_objectives(merged))]
+            if progress:
+                progress(done, len(futures))
+
+    front = front[np.argsort(front["length"], kind="stable")]
+    stats["front"] = len(front)
+    return front, stats
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    front, stats = optimize(duty=50e3, T_hot_in=120, T_cold_in=20,
+                            D_inner=np.linspace(0.01, 0.05, 21), D_outer=np.linspace(0.02, 0.08, 31),
+                            m_hot=np.linspace(0.1, 2, 50), m_cold=np.linspace(0.1, 2, 50),
+                            U=[300, 600, 900], max_dp_hot=50e3, max_dp_cold=50e3, max_length=30)
+    print(f"{stats} in {time.perf_counter() - start:.1f} s")
+    for design in front[:10]:
+        print(f"L = {design['length']:6.2f} m, ε = {design['effectiveness']:.3f}, "
+              f"T_cold_out = {design['T_cold_out']:6.2f}°C, D = {design['D_inner']:.3f}/{design['D_outer']:.3f} m")
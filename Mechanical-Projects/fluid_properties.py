@@ -0,0 +1,100 @@
+"""
+Temperature-dependent properties of heat transfer fluids.
+
+Every fluid is a small CSV table in fluid_data/ (one row per temperature in
+°C, columns rho, cp, mu, k). A table is read once per process into a
+read-only (n, 5) array. interpolator(fluid, prop) returns a vectorized
+property(T) function built on np.interp. Interpolators are kept in an LRU
+cache, so calling them inside a marching loop costs one array interpolation
+per call and no file or dictionary work. Viscosity changes by orders of
+magnitude (engine oil: 3.85 Pa.s at 0 °C, 0.0057 at 147 °C) and is
+interpolated in log space. Temperatures outside a table are clipped to its
+ends.
+
+The functions plug straight into double_pipe.solve_counterflow, e.g.
+    solve_counterflow(..., cp_hot=interpolator("engine_oil", "cp"), cp_cold=interpolator("water", "cp"), ...)
+
+Run this file directly for a speed comparison with constant properties.
+"""
+
+import functools
+import os
+import time
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fluid_data")
+PROPERTIES = ("rho", "cp", "mu", "k")
+UNITS = {"rho": "kg/m^3", "cp": "J/kg.K", "mu": "Pa.s", "k": "W/m.K"}
+LOG_PROPERTIES = {"mu"}  # Interpolated in log space
+
+
+def available_fluids():
+    """Names of the fluids with a table in DATA_DIR."""
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(DATA_DIR) if name.endswith(".csv"))
+
+
+@functools.lru_cache(maxsize=None)
+def fluid_table(fluid):
+    """Read-only array with columns T (°C), rho, cp, mu, k, read from the fluid's CSV once."""
+    path = os.path.join(DATA_DIR, f"{fluid}.csv")
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown fluid {fluid!r}, choose from {available_fluids()}")
+    table = np.loadtxt(path, delimiter=",", comments="#", ndmin=2)
+    if np.any(np.diff(table[:, 0]) <= 0):
+        raise ValueError(f"{path}: temperatures must increase from row to row")
+    table.setflags(write=False)
+    return table
+
+
+@functools.lru_cache(maxsize=64)
+def interpolator(fluid, prop):
+    """
+    Vectorized prop(T) of one fluid, T in °C (scalar or array).
+
+    :param prop: One of PROPERTIES
+    """
+    if prop not in PROPERTIES:
+        raise ValueError(f"Unknown property {prop!r}, choose from {list(PROPERTIES)}")
+    table = fluid_table(fluid)
+    T_table = np.ascontiguousarray(table[:, 0])
+    values = np.ascontiguousarray(table[:, 1 + PROPERTIES.index(prop)])
+
+    if prop in LOG_PROPERTIES:
+        log_values = np.log(values)
+
+        def lookup(T):
+            return np.exp(np.interp(T, T_table, log_values))
+    else:
+        def lookup(T):
+            return np.interp(T, T_table, values)
+
+    lookup.__doc__ = f"{prop} ({UNITS[prop]}) of {fluid} at temperatures T (°C)"
+    return lookup
+
+
+def fluid_property(fluid, prop, T):
+    """prop of fluid at temperatures T (°C), through the cached interpolator."""
+    return interpolator(fluid, prop)(T)
+
+
+def benchmark(num_cases=10_000, N=20):
+    """Prints the time of a batch of counterflow solves with constant and tabulated cp."""
+    from double_pipe import solve_counterflow
+
+    rng = np.random.default_rng(0)
+    m_hot = rng.uniform(0.2, 2, num_cases)
+    m_cold = rng.uniform(0.2, 2, num_cases)
+    UA = rng.uniform(500, 5000, num_cases)
+    tabulated = (interpolator("engine_oil", "cp"), interpolator("water", "cp"))
+    # One pass shows the cost of the lookups; the converged solve adds the Picard passes
+    cases = [("constant cp", (2100.0, 4180.0), 50), ("tabulated, 1 pass", tabulated, 1),
+             ("tabulated", tabulated, 50)]
+    for name, (cp_hot, cp_cold), max_iter in cases:
+        start = time.perf_counter()
+        solve_counterflow(1.0, 1.0, 140.0, 20.0, m_hot, m_cold, cp_hot, cp_cold, UA, N=N, max_iter=max_iter)
+        print(f"{name:>17}: {(time.perf_counter() - start) / num_cases * 1e6:7.2f} µs/case")
+
+
+if __name__ == "__main__":
+    benchmark()
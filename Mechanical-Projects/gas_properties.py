@@ -0,0 +1,185 @@
+"""
+Ideal gases with temperature-dependent specific heat, for air-standard cycles.
+
+cp(T) comes from NASA 7-coefficient polynomials (GRI-Mech 3.0 fits, two
+ranges split at 1000 K). A gas is a mixture of species by mole fraction. Its
+coefficients are the mole-weighted sums of the species coefficients. Two
+gases are defined: air, and the products of stoichiometric iso-octane
+combustion.
+
+For each gas, gas_table integrates the polynomials once, in closed form, on
+a fine uniform temperature grid. The grid holds cp, u, h and the entropy
+function φ(T) = ∫cv/T dT, all divided by the gas constant R. Between grid
+points, u, h and φ are interpolated with cubic Hermite polynomials, using
+their exact slopes cv, cp and cv/T. The result matches the polynomials to
+about 1e-9 relative. Each lookup is a few array operations and never
+evaluates the polynomials. Tables are kept in an LRU cache, so a map over
+thousands of compression ratios pays for them once.
+
+An isentropic change of volume by the factor x obeys φ(T_b) = φ(T_a) - ln x.
+isentropic_temperature solves that for every element of the arrays at once,
+with Newton's method on φ and the slope cv/T. It starts from the linear
+inverse of the φ table, so one or two steps reach the tolerance.
+
+Run this file directly for a table of cp and γ and a timing of the solver.
+"""
+
+import functools
+import time
+
+import numpy as np
+
+R_UNIVERSAL = 8.314462618  # J/mol.K
+T_MIN, T_SPLIT, T_MAX = 200.0, 1000.0, 4000.0  # K
+TABLE_STEP = 0.5  # K
+
+# Molar mass (kg/mol), then the coefficients a1..a7 below and above T_SPLIT
+SPECIES = {
+    "N2": (0.0280134, (3.298677, 1.4082404e-3, -3.963222e-6, 5.641515e-9, -2.444854e-12, -1020.8999, 3.950372),
+           (2.92664, 1.4879768e-3, -5.68476e-7, 1.0097038e-10, -6.753351e-15, -922.7977, 5.980528)),
+    "O2": (0.0319988, (3.78245636, -2.99673416e-3, 9.84730201e-6, -9.68129509e-9, 3.24372837e-12, -1063.94356,
+                       3.65767573),
+           (3.28253784, 1.48308754e-3, -7.57966669e-7, 2.09470555e-10, -2.16717794e-14, -1088.45772, 5.45323129)),
+    "CO2": (0.0440095, (2.35677352, 8.98459677e-3, -7.12356269e-6, 2.45919022e-9, -1.43699548e-13, -48371.9697,
+                        9.90105222),
+            (3.85746029, 4.41437026e-3, -2.21481404e-6, 5.23490188e-10, -4.72084164e-14, -48759.166, 2.27163806)),
+    "H2O": (0.01801528, (4.19864056, -2.0364341e-3, 6.52040211e-6, -5.48797062e-9, 1.77197817e-12, -30293.7267,
+                         -0.849032208),
+            (3.03399249, 2.17691804e-3, -1.64072518e-7, -9.7041987e-11, 1.68200992e-14, -30004.2971, 4.9667701)),
+}
+
+# Mole fractions
+GASES = {
+    "air": {"N2": 0.79, "O2": 0.21},
+    # C8H18 + 12.5 (O2 + 3.76 N2) -> 8 CO2 + 9 H2O + 47 N2
+    "products": {"CO2": 8 / 64, "H2O": 9 / 64, "N2": 47 / 64},
+}
+
+
+def _mixture(gas):
+    """(molar mass, low-range coefficients, high-range coefficients) of a gas."""
+    if gas not in GASES:
+        raise ValueError(f"Unknown gas {gas!r}, choose from {list(GASES)}")
+    fractions = GASES[gas].items()
+    molar_mass = sum(x * SPECIES[name][0] for name, x in fractions)
+    low = sum(x * np.array(SPECIES[name][1]) for name, x in fractions)
+    high = sum(x * np.array(SPECIES[name][2]) for name, x in fractions)
+    return molar_mass, low, high
+
+
+def _polynomials(a, T):
+    """cp/R, h/R (K) and s°/R of coefficients a at temperatures T."""
+    cp = a[0] + T * (a[1] + T * (a[2] + T * (a[3] + T * a[4])))
+    h = T * (a[0] + T * (a[1] / 2 + T * (a[2] / 3 + T * (a[3] / 4 + T * a[4] / 5)))) + a[5]
+    s = a[0] * np.log(T) + T * (a[1] + T * (a[2] / 2 + T * (a[3] / 3 + T * a[4] / 4))) + a[6]
+    return cp, h, s
+
+
+class GasTable:
+    """
+    cp, u, h and φ of one gas on a uniform temperature grid, all divided by R.
+
+    u and h are in kelvin (u/R, h/R), cp and φ are dimensionless.
+    """
+
+    def __init__(self, gas, step=TABLE_STEP):
+        self.gas = gas
+        molar_mass, low, high = _mixture(gas)
+        self.R = R_UNIVERSAL / molar_mass  # J/kg.K
+        self.step = step
+        self.T = np.arange(T_MIN, T_MAX + step / 2, step)
+        lower = self.T < T_SPLIT
+        cp, h, s = (np.where(lower, l, u) for l, u in zip(_polynomials(low, self.T), _polynomials(high, self.T)))
+        self.cp, self.h, self.u = cp, h, h - self.T
+        self.phi = s - np.log(self.T)
+        for array in (self.T, self.cp, self.h, self.u, self.phi):
+            array.setflags(write=False)
+
+    def _hermite(self, values, slopes, T):
+        """Cubic Hermite interpolation of values with the given slopes (d/dT) at T, and its slope."""
+        position = (np.asarray(T, dtype=float) - T_MIN) / self.step
+        if np.any((position < 0) | (position > len(self.T) - 1)):
+            raise ValueError(f"{self.gas}: temperature outside {T_MIN:.0f}-{T_MAX:.0f} K")
+        i = np.minimum(position.astype(np.intp), len(self.T) - 2)
+        t = position - i
+        y0, y1 = values[i], values[i + 1]
+        m0, m1 = slopes[i] * self.step, slopes[i + 1] * self.step
+        value = y0 + t * (m0 + t * (3 * (y1 - y0) - 2 * m0 - m1 + t * (2 * (y0 - y1) + m0 + m1)))
+        slope = (m0 + t * (6 * (y1 - y0) - 4 * m0 - 2 * m1 + t * (6 * (y0 - y1) + 3 * m0 + 3 * m1))) / self.step
+        return value, slope
+
+    def specific_heat(self, T):
+        """cp/R at T."""
+        return np.interp(T, self.T, self.cp)
+
+    def enthalpy(self, T):
+        """h/R (K) at T."""
+        return self._hermite(self.h, self.cp, T)[0]
+
+    def internal_energy(self, T):
+        """u/R (K) at T."""
+        return self._hermite(self.u, self.cp - 1, T)[0]
+
+    def entropy_function(self, T):
+        """φ(T) = ∫cv/T dT / R, with its slope cv/(R T)."""
+        return self._hermite(self.phi, (self.cp - 1) / self.T, T)
+
+
+@functools.lru_cache(maxsize=None)
+def gas_table(gas):
+    """The GasTable of a gas, built once per process."""
+    return GasTable(gas)
+
+
+def specific_heat(gas, T):
+    """cp (J/kg.K) of a gas at temperatures T (K)."""
+    table = gas_table(gas)
+    return table.R * table.specific_heat(T)
+
+
+def specific_heat_ratio(gas, T):
+    """γ = cp/cv of a gas at temperatures T (K)."""
+    cp = gas_table(gas).specific_heat(T)
+    return cp / (cp - 1)
+
+
+def isentropic_temperature(gas, T_start, volume_ratio, tol=1e-9, max_iter=20):
+    """
+    Temperature after an isentropic change of volume, for arrays of cases.
+
+    :param T_start: Temperature before the change (K)
+    :param volume_ratio: V_end/V_start (below 1 for compression)
+    :param tol: Newton tolerance on the temperature (K)
+    :return: T_end (K)
+    """
+    table = gas_table(gas)
+    T_start = np.asarray(T_start, dtype=float)
+    log_ratio = np.log(volume_ratio)
+    target = table.entropy_function(T_start)[0] - log_ratio
+    # φ increases with T, so the tabulated inverse is a start within about 1e-4 K
+    T = np.interp(target, table.phi, table.T)
+    for _ in range(max_iter):
+        phi, slope = table.entropy_function(T)
+        step = (phi - target) / slope
+        T = np.clip(T - step, T_MIN, T_MAX)
+        if np.abs(step).max() <= tol:
+            break
+    return T
+
+
+def benchmark(n=1_000_000):
+    """Prints cp and γ of both gases and times a batch of isentropic compressions."""
+    for gas in GASES:
+        T = np.array([300.0, 1000.0, 2000.0, 3000.0])
+        print(f"{gas:>8}: cp = {np.round(specific_heat(gas, T), 1)} J/kg.K, "
+              f"γ = {np.round(specific_heat_ratio(gas, T), 4)} at T = {T} K")
+    r = np.linspace(4, 25, n)
+    isentropic_temperature("air", 300.0, 1 / r)  # Builds the table and touches the memory once
+    start = time.perf_counter()
+    T2 = isentropic_temperature("air", 300.0, 1 / r)
+    print(f"{n:,} isentropic compressions in {time.perf_counter() - start:.3f} s, "
+          f"T2 = {T2[0]:.1f}-{T2[-1]:.1f} K (constant γ = 1.4: {300 * 4**0.4:.1f}-{300 * 25**0.4:.1f} K)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,50 +1,100 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
 import tkinter as tk
 from tkinter import ttk
-
-# Function to generate gear teeth
-def generate_gear(radius, teeth, resolution=100):
-    angles = np.linspace(0, 2 * np.pi, teeth * resolution)
-    r = radius + 0.2 * radius * np.sin(teeth * angles / 2)  # Simulating teeth
-    x = r * np.cos(angles)
-    y = r * np.sin(angles)
-    return x, y
+from involute import check_train, involute_profile, mesh_layout, undercut
+
+# Function to generate gear teeth (standard involute profile, tooth 0 on the +x axis)
+def generate_gear(module, teeth, resolution=40, pressure_angle=20):
+    return involute_profile(module, teeth, pressure_angle, resolution)
+
+MAX_FRAMES = 10_000  # Longest rotation table
+
+def mesh_rotations(teeth, speed):
+    """
+    Rotation matrices of every gear for a periodic stretch of frames, shape (frames, gears, 2, 2).
+
+    Gear k turns by exactly speed * teeth[0] / teeth[k] per frame, in alternating
+    directions. A gear looks the same after turning whole tooth pitches, so the
+    table may wrap once the driver has turned m pitches in a whole number of
+    frames. The table covers the smallest m (up to MAX_FRAMES frames) for which the
+    frame count is within 1 % of a step of a whole number, or else the closest one.
+    The matrices act on row vectors: [x y] @ R.
+    """
+    teeth = np.asarray(teeth, dtype=float)
+    if speed == 0:
+        frames = 1
+    else:
+        pitch = 2 * np.pi / teeth[0]
+        pitches = np.arange(1, max(1, int(MAX_FRAMES * abs(speed) / pitch)) + 1)
+        counts = np.maximum(np.round(pitches * pitch / abs(speed)), 1)
+        mismatch = np.abs(counts * abs(speed) - pitches * pitch)
+        close = np.flatnonzero(mismatch <= 0.01 * abs(speed))
+        frames = int(counts[close[0]] if len(close) else counts[np.argmin(mismatch)])
+    direction = (-1.0) ** np.arange(len(teeth))
+    angle = np.arange(frames)[:, None] * speed * direction * teeth[0] / teeth
+    c, s = np.cos(angle), np.sin(angle)
+    return np.stack((np.stack((c, s), axis=-1), np.stack((-s, c), axis=-1)), axis=-2)
 
 # Initialize gear parameters
-teeth_1, teeth_2 = 10, 20  # Default teeth count
-radius_1, radius_2 = 2, 4  # Default radii
+teeth_1, teeth_2 = 18, 36  # Default teeth count
+module = 0.25  # Pitch diameter per tooth
+pressure_angle = 20  # Degrees
 speed = 0.1  # Default rotation speed
-
-# Generate initial gear profiles
-x1, y1 = generate_gear(radius_1, teeth_1)
-x2, y2 = generate_gear(radius_2, teeth_2)
+resolution = 40  # Profile points per flank
+colors = ['b', 'r']
 
 fig, ax = plt.subplots()
-ax.set_xlim(-5, 5)
-ax.set_ylim(-5, 5)
 ax.set_aspect('equal')
 
-gear1, = ax.plot(x1, y1, 'b')
-gear2, = ax.plot(x2 + radius_1 + radius_2, y2, 'r')
+# Gear train state. Each gear is drawn as a PathPatch whose path holds its
+# vertices buffer, so a frame rotates every profile into its buffer in place
+# and allocates no coordinate arrays. The rotation matrices of one periodic
+# stretch are cached in "rotations"; both are rebuilt only when the teeth change.
+train = {"teeth": None, "profiles": [], "centers": [], "vertices": [], "patches": [], "rotations": None}
+
+def build_train(teeth):
+    """Generates the profiles, their drawing buffers and patches for gears meshing in a row."""
+    for patch in train["patches"]:
+        patch.remove()
+    centers, phases = mesh_layout(teeth, module)  # Standard centre distances, teeth meeting spaces
+    train.update(teeth=tuple(teeth), profiles=[], centers=[], vertices=[], patches=[])
+    for k, n in enumerate(teeth):
+        x, y = generate_gear(module, n, resolution, pressure_angle)
+        c, s = np.cos(phases[k]), np.sin(phases[k])
+        x, y = x * c - y * s, x * s + y * c
+        center = centers[k]
+        vertices = np.column_stack((x, y)) + center
+        patch = PathPatch(Path(vertices), fill=False, edgecolor=colors[k % len(colors)], linewidth=1.5,
+                          animated=True)
+        ax.add_patch(patch)
+        train["profiles"].append(np.column_stack((x, y)))
+        train["centers"].append(center)
+        train["vertices"].append(vertices)
+        train["patches"].append(patch)
+    reach = 1.2 * module * max(teeth) / 2
+    ax.set_xlim(-reach, centers[-1, 0] + reach)
+    ax.set_ylim(-reach, reach)
+
+def update_rotations():
+    train["rotations"] = mesh_rotations(train["teeth"], speed)
+
+build_train([teeth_1, teeth_2])
+update_rotations()
 
 # Animation function
 def update(frame):
-    angle1 = frame * speed
-    angle2 = -frame * speed * (teeth_1 / teeth_2)  # Reverse rotation for meshing
-    
-    x1_rot = x1 * np.cos(angle1) - y1 * np.sin(angle1)
-    y1_rot = x1 * np.sin(angle1) + y1 * np.cos(angle1)
-    
-    x2_rot = x2 * np.cos(angle2) - y2 * np.sin(angle2)
-    y2_rot = x2 * np.sin(angle2) + y2 * np.cos(angle2)
-    
-    gear1.set_data(x1_rot, y1_rot)
-    gear2.set_data(x2_rot + radius_1 + radius_2, y2_rot)
-    return gear1, gear2
-
-ani = animation.FuncAnimation(fig, update, frames=360, interval=50, blit=True)
+    rotations = train["rotations"][frame % len(train["rotations"])]
+    for profile, center, rotation, vertices in zip(train["profiles"], train["centers"], rotations,
+                                                   train["vertices"]):
+        np.matmul(profile, rotation, out=vertices)
+        vertices += center
+    return train["patches"]
+
+ani = animation.FuncAnimation(fig, update, frames=None, interval=50, blit=True, cache_frame_data=False)
 
 # Tkinter GUI for user input
 root = tk.Tk()
@@ -66,19 +116,33 @@ speed_entry.pack()
 speed_entry.insert(0, str(speed))
 
 def update_values():
-    global teeth_1, teeth_2, speed, x1, y1, x2, y2
+    global teeth_1, teeth_2, speed
     teeth_1 = int(teeth1_entry.get())
     teeth_2 = int(teeth2_entry.get())
     speed = float(speed_entry.get())
-    
-    # Recalculate gear profiles
-    x1, y1 = generate_gear(radius_1, teeth_1)
-    x2, y2 = generate_gear(radius_2, teeth_2)
 
     ani.event_source.stop()  # Stop previous animation
+    # Profiles and buffers only change with the tooth counts; the rotations also with the speed
+    if train["teeth"] != (teeth_1, teeth_2):
+        build_train([teeth_1, teeth_2])
+        fig.canvas.draw()  # New static background for blitting
+        check_mesh()
+    update_rotations()
     ani.event_source.start()  # Restart animation
 
+def check_mesh():
+    """Shows the worst clearance of the mesh over a full rotation."""
+    pair = check_train([teeth_1, teeth_2], module, pressure_angle, resolution=resolution)[0]
+    status = "Interference" if pair['clash_steps'] else "Mesh OK"
+    notes = [f"gear {k + 1} undercut" for k, n in enumerate((teeth_1, teeth_2)) if undercut(n, pressure_angle)]
+    check_label.config(text=f"{status}: min clearance {pair['min_clearance']:+.4f}" +
+                       (f" ({', '.join(notes)})" if notes else ""))
+
 ttk.Button(root, text="Update", command=update_values).pack()
+check_label = tk.Label(root, text="")
+check_label.pack()
+
+check_mesh()
 
 # Show Matplotlib plot without blocking Tkinter
 plt.show(block=False)
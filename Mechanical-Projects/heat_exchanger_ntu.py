@@ -0,0 +1,294 @@
+"""
+Array-native effectiveness-NTU relations of heat exchangers.
+
+effectiveness(Cr, NTU, flow) accepts scalars or any broadcastable arrays of the
+capacity ratio Cr = Cmin/Cmax (0 <= Cr <= 1) and NTU = UA/Cmin, so a whole
+design map is evaluated in a few array operations instead of one Python call
+per point. The configuration is a Flow member (or its string value).
+
+The textbook formulas contain 0/0 at Cr = 1 (counterflow, several shell
+passes) or divide by Cr (crossflow). They are rewritten here with expm1 and
+exprel(x) = (e^x - 1)/x, so the limits Cr -> 1 and Cr -> 0 are exact and
+values near them keep full precision. For Cr = 0 every configuration gives
+1 - exp(-NTU).
+
+Sizing needs the inverse, the NTU that gives a target effectiveness.
+ntu_from_effectiveness seeds every query from a precomputed table and refines
+all of them together with Newton steps. The tables (ε on a regular (Cr, NTU)
+grid and NTU on a regular (Cr, ε/ε_top) grid) are built once per configuration
+and cached on disk.
+
+Run this file directly for benchmarks against the scalar per-point function
+and of the inverse solver.
+"""
+
+import enum
+import functools
+import os
+import tempfile
+import time
+
+import numpy as np
+from scipy.special import exprel
+
+
+class Flow(enum.Enum):
+    """Heat exchanger flow arrangements."""
+    PARALLEL = "parallel"
+    COUNTERFLOW = "counterflow"
+    CROSSFLOW_UNMIXED = "crossflow, both fluids unmixed"
+    CROSSFLOW_CMAX_MIXED = "crossflow, Cmax mixed, Cmin unmixed"
+    CROSSFLOW_CMIN_MIXED = "crossflow, Cmin mixed, Cmax unmixed"
+    SHELL_AND_TUBE = "shell-and-tube"  # 2, 4, ... tube passes per shell pass
+
+
+def _parallel(Cr, NTU):
+    return -np.expm1(-NTU * (1 + Cr)) / (1 + Cr)
+
+
+def _counterflow(Cr, NTU):
+    # (1 - e^-a) / (1 - Cr e^-a), a = NTU (1 - Cr), divided through by a
+    a = NTU * (1 - Cr)
+    g = NTU * exprel(-a)
+    return g / (g + np.exp(-a))
+
+
+def _crossflow_unmixed(Cr, NTU):
+    # 1 - exp[(NTU^0.22 / Cr) (exp(-Cr NTU^0.78) - 1)] (Incropera's approximation)
+    return -np.expm1(-NTU * exprel(-Cr * NTU**0.78))
+
+
+def _crossflow_cmax_mixed(Cr, NTU):
+    # (1/Cr) (1 - exp(-Cr (1 - e^-NTU)))
+    u = -np.expm1(-NTU)
+    return u * exprel(-Cr * u)
+
+
+def _crossflow_cmin_mixed(Cr, NTU):
+    # 1 - exp(-(1/Cr) (1 - exp(-Cr NTU)))
+    return -np.expm1(-NTU * exprel(-Cr * NTU))
+
+
+def _one_shell(Cr, NTU):
+    """One shell pass: 2 / (1 + Cr + Γ coth(NTU Γ / 2)) with Γ = sqrt(1 + Cr²)."""
+    gamma = np.sqrt(1 + Cr**2)
+    t = np.tanh(NTU * gamma / 2)
+    return 2 * t / ((1 + Cr) * t + gamma)
+
+
+def _shell_and_tube(Cr, NTU, shell_passes=1):
+    eps1 = _one_shell(Cr, NTU / shell_passes)
+    if shell_passes == 1:
+        return eps1
+    # ε = (F^n - 1) / (F^n - Cr) with F = (1 - ε1 Cr) / (1 - ε1) = 1 + ε1 (1 - Cr) / (1 - ε1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        E = np.expm1(shell_passes * np.log1p(eps1 * (1 - Cr) / (1 - eps1)))
+        eps = 1 / (1 + (1 - Cr) / E)
+    return np.where(Cr == 1, shell_passes * eps1 / (1 + (shell_passes - 1) * eps1), eps)
+
+
+_KERNELS = {
+    Flow.PARALLEL: _parallel,
+    Flow.COUNTERFLOW: _counterflow,
+    Flow.CROSSFLOW_UNMIXED: _crossflow_unmixed,
+    Flow.CROSSFLOW_CMAX_MIXED: _crossflow_cmax_mixed,
+    Flow.CROSSFLOW_CMIN_MIXED: _crossflow_cmin_mixed,
+}
+
+
+def effectiveness(Cr, NTU, flow=Flow.COUNTERFLOW, shell_passes=1):
+    """
+    Heat exchanger effectiveness ε = q / q_max.
+
+    :param Cr: Capacity ratio Cmin/Cmax in [0, 1], scalar or array
+    :param NTU: Number of transfer units UA/Cmin >= 0, broadcastable with Cr
+    :param flow: Flow member or its value, e.g. Flow.COUNTERFLOW or "parallel"
+    :param shell_passes: Number of shell passes for Flow.SHELL_AND_TUBE (NTU is the total)
+    :return: Array of ε with the broadcast shape of Cr and NTU
+    """
+    flow = Flow(flow)
+    Cr = np.asarray(Cr, dtype=float)
+    NTU = np.asarray(NTU, dtype=float)
+    if np.any((Cr < 0) | (Cr > 1)):
+        raise ValueError("Cr = Cmin/Cmax must lie between 0 and 1")
+    if np.any(NTU < 0):
+        raise ValueError("NTU must not be negative")
+    if flow is Flow.SHELL_AND_TUBE:
+        return _shell_and_tube(Cr, NTU, shell_passes)
+    return _KERNELS[flow](Cr, NTU)
+
+
+# Cached table files are named after TABLE_VERSION. Bump it whenever the grids
+# or any effectiveness kernel formula change, or stale tables are reused.
+TABLE_VERSION = 1
+TABLE_CR = np.linspace(0, 1, 101)
+TABLE_NTU = np.linspace(0, 20, 401)
+TABLE_FRACTION = np.linspace(0, 1, 201)  # ε / ε_top, ε_top = ε at the largest table NTU
+NTU_LIMIT = 1e9  # Effectiveness at this NTU is taken as the asymptote ε(NTU -> ∞)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "heat_exchanger_ntu")
+
+
+def _bilinear(table, u, v):
+    """Interpolates table on the unit square (regular grid) at fractional positions u, v in [0, 1]."""
+    nu, nv = table.shape
+    u = np.clip(u, 0, 1) * (nu - 1)
+    v = np.clip(v, 0, 1) * (nv - 1)
+    i = np.minimum(u.astype(int), nu - 2)
+    j = np.minimum(v.astype(int), nv - 2)
+    fu, fv = u - i, v - j
+    return ((1 - fu) * ((1 - fv) * table[i, j] + fv * table[i, j + 1])
+            + fu * ((1 - fv) * table[i + 1, j] + fv * table[i + 1, j + 1]))
+
+
+class EffectivenessTable:
+    """
+    Precomputed ε(Cr, NTU) of one configuration and its inverse NTU(Cr, ε).
+
+    eps[i, j] is ε at TABLE_CR[i], TABLE_NTU[j]. Each Cr row increases with
+    NTU, so it is inverted with np.interp onto ntu[i, k], the NTU at which ε
+    reaches TABLE_FRACTION[k] * eps_top[i].
+    """
+
+    def __init__(self, eps):
+        self.eps = eps
+        self.eps_top = eps[:, -1]
+        self.ntu = np.array([np.interp(TABLE_FRACTION * top, row, TABLE_NTU)
+                             for row, top in zip(eps, self.eps_top)])
+
+    @classmethod
+    def build(cls, flow, shell_passes=1):
+        return cls(effectiveness(TABLE_CR[:, None], TABLE_NTU, flow, shell_passes))
+
+    def __call__(self, Cr, NTU):
+        """ε by bilinear interpolation (NTU beyond the table is clipped to its end)."""
+        return _bilinear(self.eps, np.asarray(Cr, dtype=float), np.asarray(NTU, dtype=float) / TABLE_NTU[-1])
+
+    def seed(self, Cr, eps):
+        """Approximate NTU for the target ε (the table's largest NTU above ε_top)."""
+        Cr = np.asarray(Cr, dtype=float)
+        top = np.interp(Cr, TABLE_CR, self.eps_top)
+        return _bilinear(self.ntu, Cr, np.asarray(eps, dtype=float) / top)
+
+
+@functools.lru_cache(maxsize=None)
+def effectiveness_table(flow, shell_passes=1, cache_dir=CACHE_DIR):
+    """
+    Table of one configuration, loaded from cache_dir or built and saved there.
+
+    Tables are also kept in memory, so only the first call per process reads
+    the disk. Pass cache_dir=None to build without touching the disk.
+    """
+    flow = Flow(flow)
+    if cache_dir is None:
+        return EffectivenessTable.build(flow, shell_passes)
+    path = os.path.join(cache_dir, f"{flow.name.lower()}_{shell_passes}_v{TABLE_VERSION}.npy")
+    try:
+        eps = np.load(path)
+        if eps.shape == (len(TABLE_CR), len(TABLE_NTU)):
+            return EffectivenessTable(eps)
+    except (OSError, ValueError):
+        pass
+    table = EffectivenessTable.build(flow, shell_passes)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write then rename, so a concurrent reader never sees half a file
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".npy", delete=False) as f:
+        np.save(f, table.eps)
+    os.replace(f.name, path)
+    return table
+
+
+def ntu_from_effectiveness(eps, Cr, flow=Flow.COUNTERFLOW, shell_passes=1, tol=1e-12, max_iter=30,
+                           cache_dir=CACHE_DIR):
+    """
+    NTU that gives the target effectiveness, for broadcastable arrays of ε and Cr.
+
+    Every query starts from the cached table and all unconverged queries take
+    Newton steps together, with dε/dNTU from a central difference. Targets at
+    or above the asymptote ε(NTU -> ∞) cannot be reached and give NaN.
+
+    :param tol: Stop when |ε(NTU) - target| <= tol
+    :return: Array of NTU with the broadcast shape of eps and Cr
+    """
+    flow = Flow(flow)
+    eps, Cr = np.broadcast_arrays(np.asarray(eps, dtype=float), np.asarray(Cr, dtype=float))
+    if np.any(eps < 0):
+        raise ValueError("Effectiveness must not be negative")
+    table = effectiveness_table(flow, shell_passes, cache_dir)
+
+    reachable = eps < effectiveness(Cr, NTU_LIMIT, flow, shell_passes)
+    target, ratio = eps[reachable], Cr[reachable]
+    NTU = table.seed(ratio, target)
+    active = np.arange(len(NTU))
+    for _ in range(max_iter):
+        N, c = NTU[active], ratio[active]
+        residual = effectiveness(c, N, flow, shell_passes) - target[active]
+        converged = np.abs(residual) <= tol
+        if converged.all():
+            break
+        h = 1e-6 * (1 + N)
+        slope = (effectiveness(c, N + h, flow, shell_passes)
+                 - effectiveness(c, np.maximum(N - h, 0), flow, shell_passes)) / (N + h - np.maximum(N - h, 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = N - residual / slope
+        # Newton can overshoot below zero from above the root, and the slope can
+        # underflow to zero near the asymptote: halve (or double, below the root) instead
+        bad = ~(step >= 0) | ~np.isfinite(step)
+        NTU[active] = np.where(converged, N, np.where(bad, np.where(residual > 0, N / 2, 2 * N), step))
+        active = active[~converged]
+
+    result = np.full(eps.shape, np.nan)
+    result[reachable] = NTU
+    return result
+
+
+def _effectiveness_per_point(Cr, NTU, type):
+    """The former string-dispatched scalar function of Heat_exchanger.py, kept for the benchmark."""
+    if type == 'Parallel':
+        return (1 - np.exp(-NTU * (1 + Cr))) / (1 + Cr)
+    elif type == 'Counterflow':
+        return (1 - np.exp(-NTU * (1 - Cr))) / (1 - Cr * np.exp(-NTU * (1 - Cr)))
+    elif type == 'Crossflow':
+        return 1 - np.exp(-NTU * (1 + Cr))
+    else:
+        return None
+
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000), loop_max=100_000):
+    """Prints the time to evaluate counterflow ε on n (Cr, NTU) points both ways."""
+    rng = np.random.default_rng(0)
+    print(f"{'points':>10} {'per point s':>12} {'array s':>10} {'speed-up':>9}")
+    for n in sizes:
+        Cr = rng.uniform(0, 0.99, n)  # The per-point function fails at Cr = 1
+        NTU = rng.uniform(0, 10, n)
+
+        start = time.perf_counter()
+        eps = effectiveness(Cr, NTU, Flow.COUNTERFLOW)
+        array_s = time.perf_counter() - start
+
+        loop_s = float("nan")
+        if n <= loop_max:
+            start = time.perf_counter()
+            reference = [_effectiveness_per_point(c, ntu, 'Counterflow') for c, ntu in zip(Cr, NTU)]
+            loop_s = time.perf_counter() - start
+            assert np.allclose(eps, reference, rtol=1e-12)
+        print(f"{n:>10} {loop_s:>12.4f} {array_s:>10.4f} {loop_s / array_s:>9.0f}")
+
+
+def benchmark_inverse(n=10_000):
+    """Prints the time of n sizing queries per configuration and their worst residual."""
+    rng = np.random.default_rng(0)
+    Cr = rng.uniform(0, 1, n)
+    print(f"{'configuration':>38} {'ms':>8} {'max |residual|':>15}")
+    for flow in Flow:
+        effectiveness_table(flow)  # Load or build the table outside the timing
+        eps = rng.uniform(0, 0.99, n) * effectiveness(Cr, NTU_LIMIT, flow)
+        start = time.perf_counter()
+        NTU = ntu_from_effectiveness(eps, Cr, flow)
+        ms = (time.perf_counter() - start) * 1e3
+        residual = np.abs(effectiveness(Cr, NTU, flow) - eps).max()
+        print(f"{flow.value:>38} {ms:>8.2f} {residual:>15.1e}")
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_inverse()
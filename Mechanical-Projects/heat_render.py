@@ -0,0 +1,90 @@
+"""
+Frame-decimated, off-screen rendering of rod temperature histories.
+
+A history from heat_solver (or a memory-mapped one from write_history) can
+hold far more snapshots than anyone can watch. frame_indices picks an evenly
+spaced subset of them, sized by a target frame count or by fps × duration,
+so playback speed and export time depend on that count, not on time_steps.
+
+Exports are drawn on an Agg canvas without pyplot, so they need no display.
+They can run on a background worker thread while a GUI stays responsive.
+MP4 needs ffmpeg on the PATH; GIF is written with Pillow.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+from matplotlib import animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# One worker: exports queue up instead of competing for the CPU
+_export_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def frame_indices(n_snapshots, target_frames=None, fps=30, duration=None):
+    """
+    Evenly spaced snapshot indices to draw, always including the first and last.
+
+    :param n_snapshots: Number of snapshots in the history
+    :param target_frames: Number of frames wanted (default: fps × duration, or every snapshot)
+    :param fps: Playback frame rate
+    :param duration: Playback length in seconds
+    """
+    if target_frames is None:
+        target_frames = n_snapshots if duration is None else max(int(round(fps * duration)), 1)
+    if target_frames >= n_snapshots:
+        return np.arange(n_snapshots)
+    return np.unique(np.linspace(0, n_snapshots - 1, max(target_frames, 2)).round().astype(int))
+
+
+def _writer(path, fps):
+    """Picks the encoder from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".gif":
+        return animation.PillowWriter(fps=fps)
+    if ext == ".mp4":
+        if not animation.writers.is_available("ffmpeg"):
+            raise RuntimeError("Exporting MP4 needs ffmpeg on the PATH; export a .gif instead.")
+        return animation.FFMpegWriter(fps=fps)
+    raise ValueError(f"Unsupported animation format {ext!r}, use .mp4 or .gif")
+
+
+def render_animation(T_hist, x, path, target_frames=None, fps=30, duration=None, times=None,
+                     title="1D Heat Conduction in a Rod", ylim=(0, 120), dpi=100):
+    """
+    Renders the history off-screen and encodes it to an MP4 or GIF file.
+
+    Only the sampled snapshots are read, so T_hist may be a memory map.
+
+    :param T_hist: Temperature history (snapshots, nx)
+    :param x: Node positions along the rod
+    :param path: Output file, .mp4 or .gif
+    :param times: Optional simulated time of each snapshot, shown in the title
+    :return: path
+    """
+    indices = frame_indices(len(T_hist), target_frames, fps, duration)
+    writer = _writer(path, fps)
+
+    fig = Figure(figsize=(6.4, 4.8), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    line, = ax.plot(x, T_hist[0], 'r-', linewidth=2)
+    ax.set_ylim(*ylim)
+    ax.set_xlabel("Rod Length")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_title(title)
+
+    with writer.saving(fig, path, dpi):
+        for k in indices:
+            line.set_ydata(T_hist[k])
+            if times is not None:
+                ax.set_title(f"{title} (t = {times[k]:.2f} s)")
+            writer.grab_frame()
+    return path
+
+
+def export_in_background(T_hist, x, path, **options):
+    """Starts render_animation on the export worker and returns its Future."""
+    return _export_pool.submit(render_animation, T_hist, x, path, **options)
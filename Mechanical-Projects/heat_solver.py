@@ -0,0 +1,253 @@
+"""
+Shared solver for 1D transient heat conduction in rods.
+
+The heat equation ∂T/∂t = α * ∂²T/∂x² is discretised with the explicit
+Finite Difference Method used by Heat_conduction.py and Heat_Transfer.py:
+
+    T_new[i] = T[i] + (α * dt / dx²) * (T[i+1] - 2*T[i] + T[i-1])
+
+The whole stencil is updated with array slices, and any number of rods can
+be advanced together: every rod parameter (length, alpha, boundary and
+initial temperatures) may be a scalar or an array, and the temperature field
+then has shape (*rods, nx).
+
+The explicit scheme is only stable for dt <= dx² / (2*α). The implicit
+schemes (backward Euler and Crank-Nicolson) are unconditionally stable; they
+solve a tridiagonal system per step, factorised once before time-stepping.
+
+Long runs need not keep every step: snapshots can be decimated (every k-th
+step), consumed one at a time from iter_rods, or streamed to a memory-mapped
+.npy file with write_history. When only the final profile matters,
+solve_steady stops as soon as the rods reach steady state, growing dt on the way.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# Implicitness θ of each time-stepping scheme (0 = explicit, 1 = backward Euler)
+SCHEMES = {"explicit": 0.0, "crank-nicolson": 0.5, "implicit": 1.0}
+
+
+def rod_shape(length, alpha, T_initial, T_left, T_right):
+    """Returns the batch shape of the rods described by the parameters."""
+    return np.broadcast_shapes(np.shape(length), np.shape(alpha), np.shape(T_initial),
+                               np.shape(T_left), np.shape(T_right))
+
+
+def initial_temperature(nx, shape=(), T_initial=20, T_left=100, T_right=50):
+    """Builds the starting temperature field of shape (*shape, nx)."""
+    T = np.empty(tuple(shape) + (nx,))
+    T[...] = np.asarray(T_initial, dtype=float)[..., None]
+    T[..., 0] = T_left  # Boundary conditions (fixed temperatures)
+    T[..., -1] = T_right
+    return T
+
+
+def fourier_number(length, nx, alpha, dt):
+    """Returns r = α * dt / dx² broadcast against the node axis."""
+    dx = np.asarray(length, dtype=float) / (nx - 1)
+    return np.asarray(alpha * dt / dx**2)[..., None]
+
+
+def stable_dt(length, nx, alpha):
+    """Largest explicit time step: dt <= dx² / (2*α)."""
+    dx = np.asarray(length, dtype=float) / (nx - 1)
+    return dx**2 / (2 * np.asarray(alpha, dtype=float))
+
+
+def explicit_step(T, r, out):
+    """Advances T by one explicit step, writing the result into out."""
+    interior = out[..., 1:-1]
+    np.multiply(T[..., 1:-1], -2.0, out=interior)
+    interior += T[..., 2:]
+    interior += T[..., :-2]
+    interior *= r
+    interior += T[..., 1:-1]
+    out[..., 0] = T[..., 0]
+    out[..., -1] = T[..., -1]
+    return out
+
+
+def implicit_stepper(r, nx, theta):
+    """
+    Returns step(T, out) for the θ-scheme with Fourier number r.
+
+    Interior nodes satisfy
+        (1 + 2θr) T_new[i] - θr (T_new[i-1] + T_new[i+1]) = T[i] + (1-θ) r (T[i+1] - 2*T[i] + T[i-1])
+    with the fixed boundary temperatures moved to the right-hand side. The
+    tridiagonal matrices of all rods are stacked block-diagonally and LU
+    factorised once without pivoting or reordering, which is the Thomas
+    algorithm's elimination; each step then costs one O(nx) back-substitution.
+    """
+    r = np.asarray(r, dtype=float)
+    shape = r.shape[:-1]
+    n_rods = int(np.prod(shape))
+    m = nx - 2
+    theta_r = np.broadcast_to(theta * r, shape + (1,)).reshape(n_rods, 1)
+
+    main = np.repeat(1 + 2 * theta_r, m, axis=1).ravel()
+    off = np.repeat(-theta_r, m, axis=1)
+    off[:, -1] = 0  # No coupling between neighbouring rods
+    off = off.ravel()[:-1]
+    A = sparse.diags([off, main, off], [-1, 0, 1], format="csc")
+    lu = splu(A, permc_spec="NATURAL", diag_pivot_thresh=0)
+
+    explicit_r = (1 - theta) * r
+    theta_r = theta_r.reshape(shape + (1,))
+
+    def step(T, out):
+        explicit_step(T, explicit_r, out)  # Right-hand side, boundaries copied
+        rhs = out[..., 1:-1]
+        rhs[..., :1] += theta_r * T[..., :1]
+        rhs[..., -1:] += theta_r * T[..., -1:]
+        rhs[...] = lu.solve(rhs.reshape(-1)).reshape(rhs.shape)
+        return out
+
+    return step
+
+
+def make_stepper(r, nx, scheme="explicit"):
+    """Returns step(T, out) advancing T by one step of the chosen scheme."""
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown scheme {scheme!r}, choose from {list(SCHEMES)}")
+    if scheme == "explicit":
+        return lambda T, out: explicit_step(T, r, out)
+    return implicit_stepper(r, nx, SCHEMES[scheme])
+
+
+def snapshot_steps(time_steps, every=1):
+    """Step numbers kept when storing every k-th snapshot (the final step is always kept)."""
+    return np.union1d(np.arange(0, time_steps + 1, every), [time_steps])
+
+
+def iter_rods(length=1.0, nx=20, alpha=0.01, dt=0.001, time_steps=200,
+              T_initial=20, T_left=100, T_right=50, every=1, scheme="explicit"):
+    """
+    Yields (step, T) for the steps listed by snapshot_steps(time_steps, every).
+
+    Frames are produced as they are computed and T is one of the solver's two
+    working buffers, so it is overwritten on the next iteration; copy it to keep it.
+    """
+    shape = rod_shape(length, alpha, T_initial, T_left, T_right)
+    r = np.broadcast_to(fourier_number(length, nx, alpha, dt), shape + (1,))
+    advance = make_stepper(r, nx, scheme)
+
+    T = initial_temperature(nx, shape, T_initial, T_left, T_right)
+    T_next = np.empty_like(T)
+    yield 0, T
+    for n in range(1, time_steps + 1):
+        advance(T, T_next)
+        T, T_next = T_next, T
+        if n % every == 0 or n == time_steps:
+            yield n, T
+
+
+def simulate_rods(length=1.0, nx=20, alpha=0.01, dt=0.001, time_steps=200,
+                  T_initial=20, T_left=100, T_right=50, history=True, every=1, scheme="explicit"):
+    """
+    Solves 1D transient conduction for one rod or a batch of rods.
+
+    :param length, alpha, T_initial, T_left, T_right: Scalars or arrays, one value per rod
+    :param nx: Number of grid points (shared by every rod)
+    :param dt: Time step (s)
+    :param time_steps: Number of steps to take
+    :param history: Return the stored snapshots (frames, *rods, nx) or only the final field
+    :param every: Store every k-th step, see snapshot_steps
+    :param scheme: "explicit", "implicit" (backward Euler) or "crank-nicolson"
+    :return: Temperature history or final temperature field
+    """
+    if not history:
+        every = max(time_steps, 1)
+    frames = iter_rods(length, nx, alpha, dt, time_steps, T_initial, T_left, T_right, every, scheme)
+
+    if not history:
+        for _, T in frames:
+            pass
+        return T
+
+    shape = rod_shape(length, alpha, T_initial, T_left, T_right)
+    T_hist = np.empty((len(snapshot_steps(time_steps, every)),) + shape + (nx,))
+    for k, (_, T) in enumerate(frames):
+        T_hist[k] = T
+    return T_hist
+
+
+def solve_steady(length=1.0, nx=20, alpha=0.01, dt=None, T_initial=20, T_left=100, T_right=50,
+                 tol=1e-6, max_steps=1_000_000, adaptive=True, max_change=1.0, scheme="explicit"):
+    """
+    Time-steps until the rods stop changing and returns only the final field.
+
+    With adaptive=True the time step is doubled while the largest change per
+    step stays below max_change/4 and halved when it exceeds max_change. The
+    explicit scheme never grows past 90% of its stability limit and
+    Crank-Nicolson past twice that limit (beyond it the scheme stops damping
+    the shortest wavelengths, which then oscillate instead of settling).
+    Backward Euler has no limit. A stepper is built (and factorised) once per
+    distinct dt.
+
+    :param dt: Initial time step (s), defaults to 90% of the explicit stability limit
+    :param tol: Stop once the largest temperature change in one step is below tol (°C)
+    :param max_steps: Give up after this many steps
+    :return: (final temperature field, number of steps taken, simulated time in s)
+    """
+    shape = rod_shape(length, alpha, T_initial, T_left, T_right)
+    dt_stable = float(np.min(stable_dt(length, nx, alpha)))
+    dt_limit = {"explicit": 0.9, "crank-nicolson": 2.0}.get(scheme, np.inf) * dt_stable
+    if dt is None:
+        dt = 0.9 * dt_stable
+    if scheme == "explicit":
+        dt = min(dt, dt_limit)
+
+    steppers = {}
+
+    def stepper(level):
+        if level not in steppers:
+            r = np.broadcast_to(fourier_number(length, nx, alpha, dt * 2.0**level), shape + (1,))
+            steppers[level] = make_stepper(r, nx, scheme)
+        return steppers[level]
+
+    T = initial_temperature(nx, shape, T_initial, T_left, T_right)
+    T_next = np.empty_like(T)
+    change = np.empty_like(T)
+    level, steps, t = 0, 0, 0.0
+    while steps < max_steps:
+        stepper(level)(T, T_next)
+        np.subtract(T_next, T, out=change)
+        np.abs(change, out=change)
+        largest = change.max()
+        T, T_next = T_next, T
+        steps += 1
+        t += dt * 2.0**level
+        if largest < tol:
+            break
+        if adaptive:
+            if largest > max_change:
+                level -= 1
+            elif largest < max_change / 4 and dt * 2.0**(level + 1) <= dt_limit:
+                level += 1
+    return T, steps, t
+
+
+def write_history(path, length=1.0, nx=20, alpha=0.01, dt=0.001, time_steps=200,
+                  T_initial=20, T_left=100, T_right=50, every=1, scheme="explicit"):
+    """
+    Streams the stored snapshots into a .npy file on disk as they are computed.
+
+    Only the two working buffers are held in memory. Returns the history opened
+    as a read-only memory map, see load_history.
+    """
+    shape = rod_shape(length, alpha, T_initial, T_left, T_right)
+    frames = iter_rods(length, nx, alpha, dt, time_steps, T_initial, T_left, T_right, every, scheme)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=float,
+                                    shape=(len(snapshot_steps(time_steps, every)),) + shape + (nx,))
+    for k, (_, T) in enumerate(frames):
+        out[k] = T
+    out.flush()
+    del out
+    return load_history(path)
+
+
+def load_history(path):
+    """Opens a history written by write_history without reading it into RAM."""
+    return np.load(path, mmap_mode="r")
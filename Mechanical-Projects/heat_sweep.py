@@ -0,0 +1,108 @@
+"""
+Parallel parameter sweeps for 1D heat conduction in rods.
+
+Every case is one call of the heat_solver rod model, described by a dict with
+any of the keys length, nx, alpha, dt, time_steps, T_initial, T_left, T_right
+and scheme (missing keys take the sweep defaults). Cases are spread over a
+process pool. Workers return only summaries (the final profile and the
+requested snapshot steps); they write them straight into one shared-memory
+block instead of pickling arrays back to the parent.
+
+Example:
+    cases = sweep_grid(alpha=[0.005, 0.01, 0.02], length=[0.5, 1.0], nx=[50], dt=[0.001])
+    for index, case, final, snapshots in sweep(cases, snapshots=[100, 200], time_steps=500):
+        print(case, final.max())
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+from heat_solver import iter_rods
+
+DEFAULTS = {"length": 1.0, "nx": 20, "alpha": 0.01, "dt": 0.001, "time_steps": 200,
+            "T_initial": 20, "T_left": 100, "T_right": 50, "scheme": "explicit"}
+
+
+def sweep_grid(**values):
+    """Builds one case per combination, e.g. sweep_grid(alpha=[...], nx=[...])."""
+    unknown = set(values) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown parameters {sorted(unknown)}, choose from {list(DEFAULTS)}")
+    keys = list(values)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values.values())]
+
+
+def _attach(name):
+    """Opens the parent's shared-memory block; only the parent unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: workers share the parent's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_case(shm_name, offset, case, steps):
+    """Worker: runs one case and writes [snapshots..., final] into shared memory."""
+    shm = _attach(shm_name)
+    try:
+        out = np.ndarray((len(steps) + 1, case["nx"]), dtype=float, buffer=shm.buf, offset=offset)
+        wanted = {step: k for k, step in enumerate(steps)}
+        for step, T in iter_rods(case["length"], case["nx"], case["alpha"], case["dt"], case["time_steps"],
+                                 case["T_initial"], case["T_left"], case["T_right"], scheme=case["scheme"]):
+            if step in wanted:
+                out[wanted[step]] = T
+        out[-1] = T
+        del out
+    finally:
+        shm.close()
+
+
+def sweep(cases, snapshots=(), workers=None, progress=None, **defaults):
+    """
+    Runs every case on a process pool and yields results in completion order.
+
+    :param cases: Iterable of dicts, see the module docstring
+    :param snapshots: Step numbers to keep besides the final profile (steps past a case's
+                      time_steps are skipped for that case)
+    :param workers: Number of processes (default: one per CPU)
+    :param progress: Optional callback progress(done, total), called after each case
+    :param defaults: Overrides of DEFAULTS shared by all cases
+    :return: Generator of (index, case, final profile, snapshots array)
+    """
+    base = dict(DEFAULTS)
+    base.update(defaults)
+    cases = [dict(base, **case) for case in cases]
+    steps = [sorted(s for s in set(snapshots) if 0 <= s <= case["time_steps"]) for case in cases]
+
+    # One shared block holds the (snapshots + 1) × nx summary of every case
+    offsets = np.cumsum([0] + [(len(s) + 1) * case["nx"] * 8 for s, case in zip(steps, cases)])
+    shm = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {pool.submit(_run_case, shm.name, int(offsets[i]), case, steps[i]): i
+                       for i, case in enumerate(cases)}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    i = futures[future]
+                    summary = np.ndarray((len(steps[i]) + 1, cases[i]["nx"]), dtype=float,
+                                         buffer=shm.buf, offset=int(offsets[i])).copy()
+                    if progress:
+                        progress(done, len(cases))
+                    yield i, cases[i], summary[-1], summary[:-1]
+            finally:
+                for future in futures:  # Stopped early: drop the cases not started yet
+                    future.cancel()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+if __name__ == "__main__":
+    cases = sweep_grid(alpha=[0.005, 0.01, 0.02, 0.04], length=[0.5, 1.0, 2.0], nx=[50, 100])
+    for index, case, final, snapshots in sweep(cases, snapshots=[100], time_steps=2000, scheme="implicit",
+                                               progress=lambda done, total: print(f"[{done}/{total}]", end=" ")):
+        print(f"alpha={case['alpha']}, L={case['length']}, nx={case['nx']}: "
+              f"mid-rod T = {final[case['nx'] // 2]:.2f}°C")
@@ -25,40 +25,58 @@ Expected Outcome:
 
 Usage:
 Simply run the script to visualize and analyze the Otto and Diesel cycles.
+
+For parameter studies, otto_states and diesel_states compute the state points
+without plotting. Every parameter broadcasts, so an efficiency/MEP map over
+compression ratio × cutoff ratio × gamma is one call, for example
+    diesel_states(gamma=g[None, None, :], compression_ratio=r[:, None, None], cutoff_ratio=rc[None, :, None])
+They return a structured array with P, V and T at states 1-4, the efficiency,
+the net work per cycle, the heat added and the mean effective pressure (MEP),
+computed by the shared kernel of cycles.py (which also has the Dual, Atkinson
+and Brayton cycles). Pressures are in
+the unit of P1 and volumes in the unit of V1, so the net work is in P1·V1 units.
+
+Constant γ = 1.4 overstates the efficiency at real combustion temperatures.
+With variable_cp=True, cp and γ follow the temperature instead (NASA
+polynomials for air during compression and combustion products after heat
+addition, see gas_properties.py).
 """
 
+import time
 import numpy as np
 import matplotlib.pyplot as plt
+import cycles
+from gas_properties import isentropic_temperature
 
-def otto_cycle(gamma=1.4, compression_ratio=8):
-    """Simulates and plots the Otto cycle (ideal gas assumption)."""
-    P1, T1 = 1, 300  # Initial pressure (atm) and temperature (K)
-    V1 = 1  # Initial volume (arbitrary unit)
-    V2 = V1 / compression_ratio  # Compressed volume
-    
-    # Process 1-2 (Compression - Adiabatic)
-    T2 = T1 * (V1 / V2) ** (gamma - 1)
-    P2 = P1 * (T2 / T1) * (V1 / V2)
-    
-    # Process 2-3 (Heat Addition - Constant Volume)
-    T3 = 1800  # Assumed peak temperature (K)
-    P3 = P2 * (T3 / T2)
-    V3 = V2  # Constant volume heat addition
-    
-    # Process 3-4 (Expansion - Adiabatic)
-    V4 = V1  # Returns to initial volume
-    T4 = T3 * (V3 / V4) ** (gamma - 1)
-    P4 = P3 * (T4 / T3) * (V3 / V4)
-    
-    # Efficiency Calculation (Ideal Otto Cycle)
-    efficiency = 1 - (1 / compression_ratio ** (gamma - 1))
-    
-    # Plot P-V Diagram
-    volumes = [V1, V2, V3, V4, V1]
-    pressures = [P1, P2, P3, P4, P1]
+def otto_states(gamma=1.4, compression_ratio=8, T3=1800, P1=1, T1=300, V1=1, variable_cp=False):
+    """
+    State points of the ideal Otto cycle for scalars or broadcastable arrays of every parameter.
+
+    T3 is the assumed peak temperature (K); it sets the pressure ratio of the
+    constant-volume heat addition, P3/P2 = T3/T2 with T2 = T1 r^(γ-1).
+    """
+    return otto_from_peak_temperature(gamma, compression_ratio, T3, P1, T1, V1, variable_cp).states
+
+def diesel_states(gamma=1.4, compression_ratio=15, cutoff_ratio=2, P1=1, T1=300, V1=1, variable_cp=False):
+    """State points of the ideal Diesel cycle for scalars or broadcastable arrays of every parameter."""
+    return cycles.diesel(compression_ratio, cutoff_ratio, gamma, P1, V1, T1, variable_cp).states
+
+def otto_from_peak_temperature(gamma=1.4, compression_ratio=8, T3=1800, P1=1, T1=300, V1=1, variable_cp=False):
+    """Otto cycle of the library with the heat addition given by the peak temperature T3 (γ unused with variable cp)."""
+    gamma, r = np.asarray(gamma, dtype=float), np.asarray(compression_ratio, dtype=float)
+    T2 = isentropic_temperature("air", T1, 1 / r) if variable_cp else np.asarray(T1) * r ** (gamma - 1)
+    return cycles.otto(r, np.asarray(T3) / T2, gamma, P1, V1, T1, variable_cp)
+
+def plot_cycle(cycle, label, line_style, fill_color, title):
+    """Plots the P-V diagram of one cycle with its adiabats drawn as dense curves."""
+    V, P = (a.ravel() for a in cycle.curves())
+    states = cycle.states
+    volumes = [states[f"V{i}"] for i in (1, 2, 3, 4)]
+    pressures = [states[f"P{i}"] for i in (1, 2, 3, 4)]
     plt.figure(figsize=(8, 6))
-    plt.plot(volumes, pressures, 'bo-', linewidth=3, marker='o', markersize=8, label='Otto Cycle')
-    plt.fill_between(volumes, pressures, color='cyan', alpha=0.2)
+    plt.plot(V, P, line_style, linewidth=3, label=label)
+    plt.plot(volumes, pressures, line_style[0] + 'o', markersize=8)
+    plt.fill(V, P, color=fill_color, alpha=0.2)
     
     # Annotate points
     for i, (v, p) in enumerate(zip(volumes, pressures), 1):
@@ -66,56 +84,61 @@ def otto_cycle(gamma=1.4, compression_ratio=8):
     
     plt.xlabel('Volume', fontsize=14)
     plt.ylabel('Pressure', fontsize=14)
-    plt.title('Otto Cycle P-V Diagram', fontsize=16, fontweight='bold')
+    plt.title(title, fontsize=16, fontweight='bold')
     plt.legend()
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.show()
-    
-    print(f"Otto Cycle Efficiency: {efficiency * 100:.2f}%")
 
-def diesel_cycle(gamma=1.4, compression_ratio=15, cutoff_ratio=2):
+def otto_cycle(gamma=1.4, compression_ratio=8, plot=True, variable_cp=False):
+    """Simulates and plots the Otto cycle (ideal gas assumption)."""
+    cycle = otto_from_peak_temperature(gamma, compression_ratio, variable_cp=variable_cp)
+    states = cycle.states
+    suffix = " (variable cp)" if variable_cp else ""
+    if plot:
+        plot_cycle(cycle, 'Otto Cycle' + suffix, 'b-', 'cyan', 'Otto Cycle P-V Diagram' + suffix)
+    print(f"Otto Cycle Efficiency{suffix}: {states['efficiency'] * 100:.2f}%")
+    return states
+
+def diesel_cycle(gamma=1.4, compression_ratio=15, cutoff_ratio=2, plot=True, variable_cp=False):
     """Simulates and plots the Diesel cycle (ideal gas assumption)."""
-    P1, T1 = 1, 300  # Initial pressure (atm) and temperature (K)
-    V1 = 1  # Initial volume
-    V2 = V1 / compression_ratio  # Compressed volume
-    
-    # Process 1-2 (Compression - Adiabatic)
-    T2 = T1 * (V1 / V2) ** (gamma - 1)
-    P2 = P1 * (T2 / T1) * (V1 / V2)
-    
-    # Process 2-3 (Heat Addition - Constant Pressure)
-    V3 = cutoff_ratio * V2
-    T3 = T2 * (V3 / V2)
-    P3 = P2  # Constant pressure
-    
-    # Process 3-4 (Expansion - Adiabatic)
-    V4 = V1
-    T4 = T3 * (V3 / V4) ** (gamma - 1)
-    P4 = P3 * (T4 / T3) * (V3 / V4)
-    
-    # Efficiency Calculation (Ideal Diesel Cycle)
-    efficiency = 1 - ((1 / compression_ratio ** (gamma - 1)) * ((T4 - T1) / (T3 - T2)))
-    
-    # Plot P-V Diagram
-    volumes = [V1, V2, V3, V4, V1]
-    pressures = [P1, P2, P3, P4, P1]
-    plt.figure(figsize=(8, 6))
-    plt.plot(volumes, pressures, 'ro-', linewidth=3, marker='o', markersize=8, label='Diesel Cycle')
-    plt.fill_between(volumes, pressures, color='orange', alpha=0.2)
-    
-    # Annotate points
-    for i, (v, p) in enumerate(zip(volumes, pressures), 1):
-        plt.annotate(f"{i}", (v, p), fontsize=14, fontweight='bold', color='black')
-    
-    plt.xlabel('Volume', fontsize=14)
-    plt.ylabel('Pressure', fontsize=14)
-    plt.title('Diesel Cycle P-V Diagram', fontsize=16, fontweight='bold')
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.show()
-    
-    print(f"Diesel Cycle Efficiency: {efficiency * 100:.2f}%")
+    cycle = cycles.diesel(compression_ratio, cutoff_ratio, gamma, variable_cp=variable_cp)
+    states = cycle.states
+    suffix = " (variable cp)" if variable_cp else ""
+    if plot:
+        plot_cycle(cycle, 'Diesel Cycle' + suffix, 'r-', 'orange', 'Diesel Cycle P-V Diagram' + suffix)
+    print(f"Diesel Cycle Efficiency{suffix}: {states['efficiency'] * 100:.2f}%")
+    return states
+
+def benchmark(n=100):
+    """
+    Times an n × n × n Diesel map over compression ratio × cutoff ratio × gamma,
+    and an n² × n Otto map over compression ratio × peak temperature with variable cp.
+    """
+    r = np.linspace(8, 24, n)[:, None, None]
+    rc = np.linspace(1.2, 4, n)[None, :, None]
+    gamma = np.linspace(1.3, 1.4, n)[None, None, :]
+    start = time.perf_counter()
+    states = diesel_states(gamma, r, rc)
+    elapsed = time.perf_counter() - start
+    print(f"Diesel map of {states.size:,} points in {elapsed:.3f} s, "
+          f"efficiency {states['efficiency'].min():.3f}-{states['efficiency'].max():.3f}")
+
+    r = np.linspace(6, 14, n * n)[:, None]
+    T3 = np.linspace(1500, 2800, n)[None, :]
+    start = time.perf_counter()
+    states = otto_states(compression_ratio=r, T3=T3, variable_cp=True)
+    elapsed = time.perf_counter() - start
+    print(f"Variable-cp Otto map of {states.size:,} points in {elapsed:.3f} s, "
+          f"efficiency {states['efficiency'].min():.3f}-{states['efficiency'].max():.3f}")
 
 # Run the simulations
-otto_cycle()
-diesel_cycle()
+if __name__ == "__main__":
+    otto_cycle()
+    diesel_cycle()
+    otto_cycle(variable_cp=True)
+    diesel_cycle(variable_cp=True)
+    r = np.array([6, 8, 10, 12])
+    for name, states in (("γ = 1.4", otto_states(compression_ratio=r)),
+                         ("variable cp", otto_states(compression_ratio=r, variable_cp=True))):
+        print(f"Otto efficiency with {name:>11} at r = {r}: {np.round(states['efficiency'] * 100, 2)}%")
+    benchmark()
@@ -3,6 +3,18 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import tkinter as tk
 from tkinter import messagebox
+from double_pipe import solve_counterflow
+from fluid_properties import available_fluids, interpolator
+
+CONSTANT_CP = "Constant cp (entry)"
+
+def specific_heat(fluid, entry):
+    """cp of a stream: the tabulated cp(T) of the chosen fluid, or the constant typed in."""
+    return float(entry.get()) if fluid == CONSTANT_CP else interpolator(fluid, "cp")
+
+def mean_value(cp, T_in, T_out):
+    """cp at the mean stream temperature (the constant itself if cp is not tabulated)."""
+    return float(cp((T_in + T_out) / 2)) if callable(cp) else cp
 
 def calculate_cfd():
     try:
@@ -14,38 +26,27 @@ def calculate_cfd():
         T_cold_in = float(entry_T_cold_in.get())  # Cold fluid inlet temp (°C)
         m_hot = float(entry_m_hot.get())  # Mass flow rate of hot fluid (kg/s)
         m_cold = float(entry_m_cold.get())  # Mass flow rate of cold fluid (kg/s)
-        cp_hot = float(entry_cp_hot.get())  # Specific heat of hot fluid (J/kg.K)
-        cp_cold = float(entry_cp_cold.get())  # Specific heat of cold fluid (J/kg.K)
+        cp_hot = specific_heat(hot_fluid.get(), entry_cp_hot)  # Specific heat of hot fluid (J/kg.K)
+        cp_cold = specific_heat(cold_fluid.get(), entry_cp_cold)  # Specific heat of cold fluid (J/kg.K)
         k_pipe = float(entry_k_pipe.get())  # Pipe thermal conductivity (W/m.K)
         U = float(entry_U.get())  # User-input heat transfer coefficient
 
-        # Increase resolution for accuracy
-        N = 500  # More divisions for better accuracy
-        dx = L / N
-
-        # Initialize temperature arrays
-        T_hot = np.zeros(N+1)
-        T_cold = np.zeros(N+1)
-        T_hot[0] = T_hot_in
-        T_cold[0] = T_cold_in
+        N = int(entry_N.get())  # Number of cells along the exchanger
 
-        # Iterative energy balance
-        for i in range(N):
-            dQ = U * np.pi * D_inner * dx * (T_hot[i] - T_cold[i])
-            dT_hot = dQ / (m_hot * cp_hot)
-            dT_cold = dQ / (m_cold * cp_cold)
+        # Counterflow: hot fluid enters at x = 0, cold fluid at x = L
+        x, T_hot, T_cold = solve_counterflow(L, np.pi * D_inner, T_hot_in, T_cold_in, m_hot, m_cold,
+                                             cp_hot, cp_cold, U, N=N)
 
-            T_hot[i+1] = T_hot[i] - dT_hot
-            T_cold[i+1] = T_cold[i] + dT_cold
-
-        # Extract final outlet temperatures
+        # Extract outlet temperatures (the cold fluid leaves at x = 0)
         T_hot_out = T_hot[-1]
-        T_cold_out = T_cold[-1]
+        T_cold_out = T_cold[0]
 
-        # Effectiveness Calculation (NTU Method)
-        C_min = min(m_hot * cp_hot, m_cold * cp_cold)
+        # Effectiveness Calculation (NTU Method), tabulated cp taken at the mean stream temperature
+        cp_hot_mean = mean_value(cp_hot, T_hot_in, T_hot_out)
+        cp_cold_mean = mean_value(cp_cold, T_cold_in, T_cold_out)
+        C_min = min(m_hot * cp_hot_mean, m_cold * cp_cold_mean)
         Q_max = C_min * (T_hot_in - T_cold_in)
-        Q_actual = m_cold * cp_cold * (T_cold_out - T_cold_in)
+        Q_actual = m_cold * cp_cold_mean * (T_cold_out - T_cold_in)
         effectiveness = Q_actual / Q_max
 
         # Display results
@@ -56,7 +57,6 @@ def calculate_cfd():
 
         # Plot temperature distribution
         sns.set_theme(style="darkgrid")
-        x = np.linspace(0, L, N+1)
         plt.figure(figsize=(10, 6))
         plt.plot(x, T_hot, label="Hot Fluid Temperature", color='r', linewidth=2.5)
         plt.plot(x, T_cold, label="Cold Fluid Temperature", color='b', linewidth=2.5, linestyle='--')
@@ -76,7 +76,7 @@ def calculate_cfd():
 # GUI Setup
 root = tk.Tk()
 root.title("Optimized CFD Analysis - Counterflow HE")
-root.geometry("450x600")
+root.geometry("450x760")
 
 # Labels and Entry Fields
 tk.Label(root, text="Length of HE (m):").pack()
@@ -115,6 +115,15 @@ tk.Label(root, text="Specific Heat of Cold Fluid (J/kg.K):").pack()
 entry_cp_cold = tk.Entry(root)
 entry_cp_cold.pack()
 
+# Tabulated fluids replace the cp entries with temperature-dependent cp(T)
+tk.Label(root, text="Hot Fluid Properties:").pack()
+hot_fluid = tk.StringVar(value=CONSTANT_CP)
+tk.OptionMenu(root, hot_fluid, CONSTANT_CP, *available_fluids()).pack()
+
+tk.Label(root, text="Cold Fluid Properties:").pack()
+cold_fluid = tk.StringVar(value=CONSTANT_CP)
+tk.OptionMenu(root, cold_fluid, CONSTANT_CP, *available_fluids()).pack()
+
 tk.Label(root, text="Pipe Thermal Conductivity (W/m.K):").pack()
 entry_k_pipe = tk.Entry(root)
 entry_k_pipe.pack()
@@ -123,6 +132,11 @@ tk.Label(root, text="Overall Heat Transfer Coefficient (U) (W/m².K):").pack()
 entry_U = tk.Entry(root)
 entry_U.pack()
 
+tk.Label(root, text="Number of Cells (N):").pack()
+entry_N = tk.Entry(root)
+entry_N.insert(0, "100")
+entry_N.pack()
+
 # Button to Calculate
 tk.Button(root, text="Calculate", command=calculate_cfd).pack()
 
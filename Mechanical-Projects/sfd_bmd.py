@@ -1,63 +1,133 @@
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from beam_loads import ShearMomentDiagram
+
+DEBOUNCE_MS = 30  # Slider moves within this delay are merged into one recalculation
+
+# GUI state: pending slider recalculation, saved plot backgrounds and the start of a full redraw
+state = {"pending": None, "backgrounds": [], "frame_start": None, "syncing": False}
+
+def _fill_vertices(x, y):
+    """Outline of the area between the curve and the axis, as drawn by fill_between."""
+    return np.concatenate((np.column_stack((x, y)), np.column_stack((x[::-1], np.zeros(len(x))))))
+
+def _fits(ax, y):
+    """True if the values and the zero line lie inside the current y-limits."""
+    low, high = ax.get_ylim()
+    return low <= min(y.min(), 0) and max(y.max(), 0) <= high
+
+def _set_limits(ax, L, y, keep=False):
+    """Fits the axes to the beam and the values (keep=True only ever enlarges the y-range)."""
+    low, high = min(y.min(), 0), max(y.max(), 0)
+    pad = 0.1 * (high - low) or 1.0
+    low, high = low - pad, high + pad
+    if keep:
+        current = ax.get_ylim()
+        low, high = min(low, current[0]), max(high, current[1])
+    ax.set_xlim(0, L)
+    ax.set_ylim(low, high)
+
+def show_frame_time(seconds, mode):
+    frame_time_label.config(text=f"⏱ Frame time: {seconds * 1e3:.1f} ms ({mode})")
+
+def on_draw(event):
+    """After a full redraw: saves the static background of each plot and draws the diagrams on it."""
+    state["backgrounds"] = [canvas.copy_from_bbox(ax.bbox) for ax in (ax1, ax2)]
+    for ax, artists in ((ax1, shear_artists), (ax2, moment_artists)):
+        for artist in artists:
+            ax.draw_artist(artist)
+    if state["frame_start"] is not None:
+        show_frame_time(time.perf_counter() - state["frame_start"], "full redraw")
+        state["frame_start"] = None
+
+def update_diagrams(L, P, a, rescale=False):
+    """
+    Recomputes the diagrams and updates the existing artists in place.
+
+    If the new diagrams fit the current axes only the two curves are redrawn
+    over the saved backgrounds (blitting); otherwise the axes are resized and
+    a full redraw is requested with draw_idle.
+    """
+    start = time.perf_counter()
+
+    # Exact piecewise diagrams of the simply supported beam (reactions included)
+    diagram = ShearMomentDiagram(L, point_loads=[(a, P)])
+    x, V, M = diagram.plot_points()
+
+    # Calculate max values (exact, at breakpoints or points of zero shear)
+    extremes = diagram.extremes()
+    max_shear_force = max(abs(extremes["max_shear"][0]), abs(extremes["min_shear"][0]))
+    max_bending_moment = max(extremes["max_moment"][0], extremes["min_moment"][0], key=abs)
+
+    shear_line.set_data(x, V)
+    shear_fill.set_verts([_fill_vertices(x, V)])
+    moment_line.set_data(x, M)
+    moment_fill.set_verts([_fill_vertices(x, M)])
+
+    full = (rescale or not state["backgrounds"] or ax1.get_xlim() != (0, L)
+            or not _fits(ax1, V) or not _fits(ax2, M))
+    if full:
+        _set_limits(ax1, L, V, keep=not rescale)
+        _set_limits(ax2, L, M, keep=not rescale)
+        state["frame_start"] = start
+        canvas.draw_idle()
+    else:
+        for ax, artists, background in zip((ax1, ax2), (shear_artists, moment_artists), state["backgrounds"]):
+            canvas.restore_region(background)
+            for artist in artists:
+                ax.draw_artist(artist)
+            canvas.blit(ax.bbox)
+        show_frame_time(time.perf_counter() - start, "blit")
+
+    # Display max values
+    max_values_label.config(text=f"📌 Maximum Shear Force: {max_shear_force:.2f} N\n📌 Maximum Bending Moment: {max_bending_moment:.2f} Nm", 
+                            font=("Arial", 14, "bold"), foreground="green")
+
+def read_inputs():
+    return float(length_entry.get()), float(load_entry.get()), float(position_entry.get())
 
 def calculate_sfd_bmd():
     try:
-        L = float(length_entry.get())
-        P = float(load_entry.get())
-        a = float(position_entry.get())
-        
-        # Calculate reactions at supports (Simply Supported Beam)
-        Rb = (P * a) / L
-        Ra = P - Rb
-        
-        # Shear Force Calculation
-        x = np.linspace(0, L, 100)
-        V = np.piecewise(x, [x < a, x >= a], [Ra, Ra - P])
-        
-        # Bending Moment Calculation
-        M = np.piecewise(x, [x < a, x >= a], [lambda x: Ra * x, lambda x: Ra * x - P * (x - a)])
-        
-        # Calculate max values
-        max_shear_force = max(abs(V))
-        max_bending_moment = (Ra * a)  # Max bending moment at 'a'
-        
-        # Clear previous plots
-        ax1.clear()
-        ax2.clear()
-        
-        # Plot SFD
-        ax1.plot(x, V, label="Shear Force", color='royalblue', linewidth=2)
-        ax1.fill_between(x, 0, V, color='lightblue', alpha=0.5)
-        ax1.axhline(0, color='black', linewidth=1)
-        ax1.set_title("Shear Force Diagram (SFD)", fontsize=16, fontweight='bold', color='navy')
-        ax1.set_xlabel("Beam Length (m)", fontsize=14)
-        ax1.set_ylabel("Shear Force (N)", fontsize=14)
-        ax1.legend()
-        ax1.grid(True, linestyle="--", alpha=0.7)
-        
-        # Plot BMD
-        ax2.plot(x, M, label="Bending Moment", color='darkred', linewidth=2)
-        ax2.fill_between(x, 0, M, color='lightcoral', alpha=0.5)
-        ax2.axhline(0, color='black', linewidth=1)
-        ax2.set_title("Bending Moment Diagram (BMD)", fontsize=16, fontweight='bold', color='maroon')
-        ax2.set_xlabel("Beam Length (m)", fontsize=14)
-        ax2.set_ylabel("Bending Moment (Nm)", fontsize=14)
-        ax2.legend()
-        ax2.grid(True, linestyle="--", alpha=0.7)
-        
-        # Update plots
-        canvas.draw()
-
-        # Display max values
-        max_values_label.config(text=f"📌 Maximum Shear Force: {max_shear_force:.2f} N\n📌 Maximum Bending Moment: {max_bending_moment:.2f} Nm", 
-                                font=("Arial", 14, "bold"), foreground="green")
-
+        L, P, a = read_inputs()
+        update_diagrams(L, P, a, rescale=True)
+        result_label.config(text="")
     except ValueError:
         result_label.config(text="Invalid input! Please enter valid numbers.", font=("Arial", 14, "bold"), foreground="red")
+        return
+
+    # Slider ranges follow the entered values: load up to twice P, position over the beam
+    state["syncing"] = True
+    load_slider.config(from_=min(0, 2 * P), to=max(0, 2 * P) or 1000)
+    load_slider.set(P)
+    position_slider.config(from_=0, to=L)
+    position_slider.set(a)
+    state["syncing"] = False
+
+def recalculate_live():
+    state["pending"] = None
+    try:
+        update_diagrams(*read_inputs())
+        result_label.config(text="")
+    except ValueError:
+        result_label.config(text="Invalid input! Please enter valid numbers.", font=("Arial", 14, "bold"), foreground="red")
+
+def _set_entry(entry, value):
+    entry.delete(0, tk.END)
+    entry.insert(0, f"{value:.2f}")
+
+def on_slider(_value):
+    """Copies the sliders into the entries and schedules one debounced recalculation."""
+    if state["syncing"]:
+        return
+    _set_entry(load_entry, load_slider.get())
+    _set_entry(position_entry, position_slider.get())
+    if state["pending"] is not None:
+        root.after_cancel(state["pending"])
+    state["pending"] = root.after(DEBOUNCE_MS, recalculate_live)
 
 # GUI Setup
 root = tk.Tk()
@@ -105,12 +175,18 @@ ttk.Label(frame, text="Load Position (m):", font=label_font, background="#f0f8ff
 position_entry = ttk.Entry(frame, font=entry_font, width=10)
 position_entry.grid(row=2, column=1, padx=5, pady=5)
 
+# Sliders for live updates while dragging (set their ranges with Calculate)
+load_slider = ttk.Scale(frame, from_=0, to=1000, orient="horizontal", length=250, command=on_slider)
+load_slider.grid(row=1, column=2, padx=5, pady=5)
+position_slider = ttk.Scale(frame, from_=0, to=10, orient="horizontal", length=250, command=on_slider)
+position_slider.grid(row=2, column=2, padx=5, pady=5)
+
 # Improved Calculate Button
 calculate_button = ttk.Button(frame, text="🚀 Calculate SFD & BMD 🚀", command=calculate_sfd_bmd, style='Custom.TButton')
-calculate_button.grid(row=3, column=0, columnspan=2, pady=15)
+calculate_button.grid(row=3, column=0, columnspan=3, pady=15)
 
 result_label = ttk.Label(frame, text="", font=label_font, background="#f0f8ff")
-result_label.grid(row=4, column=0, columnspan=2)
+result_label.grid(row=4, column=0, columnspan=3)
 
 # Matplotlib Figure - Maximized for Clear Display
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6), facecolor="#ffffff")
@@ -118,8 +194,36 @@ fig.subplots_adjust(left=0.05, right=0.75, top=0.92, bottom=0.5, wspace=0.3)  #
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().grid(row=2, column=0, padx=5, pady=5, sticky='nsew')
 
+# Plot SFD: the curve and its fill are created once and only their data changes
+shear_fill = ax1.fill_between([], [], color='lightblue', alpha=0.5, animated=True)
+shear_line, = ax1.plot([], [], label="Shear Force", color='royalblue', linewidth=2, animated=True)
+shear_artists = (shear_fill, shear_line)
+ax1.axhline(0, color='black', linewidth=1)
+ax1.set_title("Shear Force Diagram (SFD)", fontsize=16, fontweight='bold', color='navy')
+ax1.set_xlabel("Beam Length (m)", fontsize=14)
+ax1.set_ylabel("Shear Force (N)", fontsize=14)
+ax1.legend()
+ax1.grid(True, linestyle="--", alpha=0.7)
+
+# Plot BMD
+moment_fill = ax2.fill_between([], [], color='lightcoral', alpha=0.5, animated=True)
+moment_line, = ax2.plot([], [], label="Bending Moment", color='darkred', linewidth=2, animated=True)
+moment_artists = (moment_fill, moment_line)
+ax2.axhline(0, color='black', linewidth=1)
+ax2.set_title("Bending Moment Diagram (BMD)", fontsize=16, fontweight='bold', color='maroon')
+ax2.set_xlabel("Beam Length (m)", fontsize=14)
+ax2.set_ylabel("Bending Moment (Nm)", fontsize=14)
+ax2.legend()
+ax2.grid(True, linestyle="--", alpha=0.7)
+
+canvas.mpl_connect("draw_event", on_draw)
+
 # Label to Display Maximum SFD & BMD
 max_values_label = ttk.Label(root, text="", font=("Arial", 14, "bold"), background="#f0f8ff", foreground="green")
 max_values_label.grid(row=3, column=0, padx=10, pady=10)
 
+# Time taken by the last redraw
+frame_time_label = ttk.Label(root, text="", font=("Arial", 11), background="#f0f8ff", foreground="gray25")
+frame_time_label.grid(row=4, column=0, padx=10, pady=5)
+
 root.mainloop()
@@ -1,3 +1,18 @@
+import bisect
+import contextlib
+import functools
+import heapq
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+MIN_RUN = 32  # Shorter natural runs are extended to this length by binary insertion
+MIN_GALLOP = 7  # Wins in a row for one run before a merge starts galloping
+
 def merge_sort(arr):
     if len(arr) <= 1:
         return arr
@@ -10,12 +25,294 @@ def merge(left, right):
     sorted_arr = []
     i = j = 0
     while i < len(left) and j < len(right):
-        if left[i] < right[j]:
-            sorted_arr.append(left[i])
-            i += 1
-        else:
+        if right[j] < left[i]:
             sorted_arr.append(right[j])
             j += 1
+        else:  # Ties take from the left, which keeps the sort stable
+            sorted_arr.append(left[i])
+            i += 1
     sorted_arr.extend(left[i:])
     sorted_arr.extend(right[j:])
     return sorted_arr
+
+def _count_run(items, lo):
+    """
+    Length of the run that starts at lo. A strictly descending run is reversed in place
+    (strictly, so that reversing never swaps equal elements).
+    """
+    hi = lo + 1
+    if hi == len(items):
+        return 1
+    if items[hi] < items[lo]:
+        while hi + 1 < len(items) and items[hi + 1] < items[hi]:
+            hi += 1
+        items[lo:hi + 1] = items[lo:hi + 1][::-1]
+    else:
+        while hi + 1 < len(items) and not items[hi + 1] < items[hi]:
+            hi += 1
+    return hi + 1 - lo
+
+def _binary_insertion_sort(items, lo, start, hi):
+    """Sorts items[lo:hi], of which items[lo:start] is already sorted."""
+    for i in range(start, hi):
+        x = items[i]
+        pos = bisect.bisect_right(items, x, lo, i)  # After equal elements: stable
+        if pos < i:
+            items[pos + 1:i + 1] = items[pos:i]
+            items[pos] = x
+
+def _merge_runs(src, dst, lo, mid, hi):
+    """
+    Merges the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi], stably.
+
+    Elements that are already in place at either end are copied as slices. In
+    between, once one run has won MIN_GALLOP comparisons in a row, a binary
+    search finds how far it keeps winning, and that stretch is copied as one slice.
+    """
+    if not src[mid] < src[mid - 1]:  # Already in order
+        dst[lo:hi] = src[lo:hi]
+        return
+    i = bisect.bisect_right(src, src[mid], lo, mid)  # Left elements before the whole right run
+    dst[lo:i] = src[lo:i]
+    end = bisect.bisect_left(src, src[mid - 1], mid, hi)  # Right elements after the whole left run
+    dst[end:hi] = src[end:hi]
+
+    j, k = mid, i
+    left_wins = right_wins = 0
+    while i < mid and j < end:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP and j < end:
+                stop = bisect.bisect_left(src, src[i], j, end)
+                dst[k:k + stop - j] = src[j:stop]
+                k += stop - j
+                j = stop
+                right_wins = 0
+        else:
+            dst[k] = src[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP and i < mid:
+                stop = bisect.bisect_right(src, src[j], i, mid)
+                dst[k:k + stop - i] = src[i:stop]
+                k += stop - i
+                i = stop
+                left_wins = 0
+    dst[k:k + mid - i] = src[i:mid]
+    k += mid - i
+    dst[k:end] = src[j:end]
+
+def natural_merge_sort(arr, key=None, reverse=False):
+    """
+    Stable bottom-up merge sort of a list, in place.
+
+    Runs already in the data are found first: ascending runs, and strictly
+    descending runs, which are reversed. Short runs are extended by binary
+    insertion, so sorted and nearly sorted input costs about one pass. The runs
+    are then merged pairwise, pass by pass, back and forth between the list and
+    one auxiliary buffer of the same size. Merges gallop over long stretches
+    taken from the same run.
+
+    :param arr: List to sort
+    :param key: Function giving the sort key of an element (called once per element)
+    :param reverse: Sort in descending order; equal elements still keep their order
+    :return: arr, sorted
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+    if reverse:
+        # A stable ascending sort of the reversed list, reversed again, is the stable descending order
+        arr.reverse()
+    items = arr if key is None else [(key(x), i) for i, x in enumerate(arr)]
+
+    runs = [0]
+    while runs[-1] < n:
+        lo = runs[-1]
+        run = _count_run(items, lo)
+        if run < MIN_RUN:
+            _binary_insertion_sort(items, lo, lo + run, min(lo + MIN_RUN, n))
+            run = min(MIN_RUN, n - lo)
+        runs.append(lo + run)
+
+    src, dst = items, [None] * n
+    while len(runs) > 2:
+        merged = [0]
+        for r in range(0, len(runs) - 2, 2):
+            _merge_runs(src, dst, runs[r], runs[r + 1], runs[r + 2])
+            merged.append(runs[r + 2])
+        if merged[-1] < n:  # Odd run out
+            dst[merged[-1]:] = src[merged[-1]:]
+            merged.append(n)
+        runs = merged
+        src, dst = dst, src
+    if src is not items:
+        items[:] = src
+
+    if key is not None:
+        arr[:] = [arr[i] for _, i in items]
+    if reverse:
+        arr.reverse()
+    return arr
+
+def _read_records(file, record_size=None):
+    """Records of a binary file: lines (without their newline) or blocks of record_size bytes."""
+    if record_size is None:
+        for line in file:
+            yield line[:-1] if line.endswith(b"\n") else line
+    else:
+        for record in iter(functools.partial(file.read, record_size), b""):
+            if len(record) != record_size:
+                raise ValueError(f"{file.name}: {len(record)} trailing bytes are not a whole "
+                                 f"{record_size}-byte record")
+            yield record
+
+def _write_records(file, records, record_size=None):
+    """Writes records to a binary file, ending each line with a newline again."""
+    if record_size is None:
+        records = (record + b"\n" for record in records)
+    file.writelines(records)
+
+def _chunks(records, memory_limit):
+    """Lists of consecutive records, each holding about memory_limit bytes in memory."""
+    chunk, size = [], 0
+    for record in records:
+        chunk.append(record)
+        size += sys.getsizeof(record) + 8  # The bytes object and its list slot
+        if size >= memory_limit:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+def _merge_files(paths, output_path, record_size, key, reverse, buffer_size):
+    """
+    Streams the k-way merge of sorted run files into output_path.
+
+    heapq.merge takes equal records from the earlier run first, as merge takes
+    them from the left list, so merging consecutive runs keeps the sort stable.
+    """
+    with contextlib.ExitStack() as stack:
+        runs = [_read_records(stack.enter_context(open(path, "rb", buffering=buffer_size)), record_size)
+                for path in paths]
+        output = stack.enter_context(open(output_path, "wb", buffering=buffer_size))
+        _write_records(output, heapq.merge(*runs, key=key, reverse=reverse), record_size)
+
+def external_sort(input_path, output_path, record_size=None, key=None, reverse=False,
+                  memory_limit=256 * 2**20, fan_in=64, buffer_size=2**20, temp_dir=None):
+    """
+    Stable sort of a file of records that may be larger than memory.
+
+    The input is read in chunks of about memory_limit bytes. Each chunk is sorted
+    with natural_merge_sort and written as a run to a temporary file. Runs are
+    then merged with a heap, at most fan_in at a time. Groups of consecutive runs
+    are merged into longer runs until a single pass can write the output. No
+    more than one chunk is held in memory at any time, and a merge holds
+    one buffer per open run.
+
+    :param input_path, output_path: Files to read and write (they may be the same)
+    :param record_size: None for lines, or the size in bytes of fixed-width binary records.
+                        Lines are compared without their newline, so "a" sorts before "a\\tx",
+                        and every output line ends with a newline (a missing final one is added)
+    :param key: Function giving the sort key of a record (bytes, a line without its newline);
+                records compare as bytes by default
+    :param reverse: Sort in descending order; equal records still keep their order
+    :param memory_limit: Approximate bytes of records held in memory, Python overhead included
+    :param fan_in: Most runs merged at once (at least 2)
+    :param buffer_size: I/O buffer per file, reduced so that a merge's buffers fit in memory_limit
+    :param temp_dir: Directory for the runs (default: the system temporary directory)
+    :return: (records, runs), the number of records sorted and of runs written from the input
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    buffer_size = max(io.DEFAULT_BUFFER_SIZE, min(buffer_size, memory_limit // (fan_in + 1)))
+
+    with tempfile.TemporaryDirectory(dir=temp_dir) as work_dir:
+        names = (os.path.join(work_dir, f"run{i}") for i in range(sys.maxsize))
+        runs, records = [], 0
+        with open(input_path, "rb", buffering=buffer_size) as source:
+            for chunk in _chunks(_read_records(source, record_size), memory_limit):
+                natural_merge_sort(chunk, key, reverse)
+                records += len(chunk)
+                runs.append(next(names))
+                with open(runs[-1], "wb", buffering=buffer_size) as run:
+                    _write_records(run, chunk, record_size)
+                del chunk  # Free it before the next chunk is read
+        initial_runs = len(runs)
+
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                if len(group) == 1:
+                    merged.extend(group)
+                    continue
+                merged.append(next(names))
+                _merge_files(group, merged[-1], record_size, key, reverse, buffer_size)
+                for path in group:
+                    os.remove(path)
+            runs = merged
+
+        if len(runs) == 1:
+            shutil.move(runs[0], output_path)
+        else:  # Also writes an empty output for an empty input
+            _merge_files(runs, output_path, record_size, key, reverse, buffer_size)
+    return records, initial_runs
+
+def benchmark(n=200_000):
+    """Prints the time of merge_sort and natural_merge_sort on random, presorted and nearly sorted lists."""
+    rng = random.Random(0)
+    presorted = sorted(rng.random() for _ in range(n))
+    nearly_sorted = list(presorted)
+    for _ in range(n // 100):  # 1 % of the elements swapped at random
+        a, b = rng.randrange(n), rng.randrange(n)
+        nearly_sorted[a], nearly_sorted[b] = nearly_sorted[b], nearly_sorted[a]
+    inputs = {"random": [rng.random() for _ in range(n)], "presorted": presorted,
+              "nearly sorted": nearly_sorted, "reversed": presorted[::-1]}
+
+    for name, data in inputs.items():
+        start = time.perf_counter()
+        expected = merge_sort(data)
+        recursive = time.perf_counter() - start
+        result = list(data)
+        start = time.perf_counter()
+        natural_merge_sort(result)
+        natural = time.perf_counter() - start
+        assert result == expected
+        print(f"{name:>14}: merge_sort {recursive:6.3f} s, natural_merge_sort {natural:6.3f} s "
+              f"({recursive / natural:5.1f}x)")
+
+    # Records sorted by one field: equal scores must keep their id order
+    records = [{"id": i, "score": rng.randrange(100)} for i in range(n)]
+    start = time.perf_counter()
+    natural_merge_sort(records, key=lambda record: record["score"], reverse=True)
+    elapsed = time.perf_counter() - start
+    assert records == sorted(records, key=lambda record: record["score"], reverse=True)
+    print(f"{'records, key=':>14} natural_merge_sort {elapsed:6.3f} s, stable and descending")
+
+def benchmark_external(n=1_000_000, memory_limit=8 * 2**20, fan_in=4):
+    """Sorts a file of n random lines with a small memory limit, so that the merge takes several passes."""
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "lines.txt")
+        with open(path, "wb") as file:
+            file.writelines(f"{rng.random()}\n".encode() for _ in range(n))
+        start = time.perf_counter()
+        records, runs = external_sort(path, path + ".sorted", memory_limit=memory_limit, fan_in=fan_in)
+        elapsed = time.perf_counter() - start
+        with open(path, "rb") as file, open(path + ".sorted", "rb") as result:
+            assert result.read().splitlines() == sorted(file.read().splitlines())
+        print(f"external_sort: {records:,} lines ({os.path.getsize(path) / 2**20:.0f} MiB) in {runs} runs, "
+              f"memory limit {memory_limit / 2**20:.0f} MiB, fan-in {fan_in}: {elapsed:.2f} s")
+
+# Example usage
+if __name__ == "__main__":
+    print(natural_merge_sort([5, 2, 9, 1, 5, 6], reverse=True))
+    benchmark()
+    benchmark_external()